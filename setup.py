@@ -41,6 +41,7 @@ version = get_version_from_source("src/dt_data_api/__init__.py")
 
 install_requires = ["requests", "beautifulsoup4", "lxml", "dt-authentication-{}".format(distro)]
 tests_require = []
+extras_require = {"http2": ["httpx[http2]"]}
 
 # compile description
 underline = "=" * (len(package_name) + len(short_description) + 2)
@@ -62,6 +63,7 @@ setup(
     url=library_webpage,
     tests_require=tests_require,
     install_requires=install_requires,
+    extras_require=extras_require,
     package_dir={"": "src"},
     packages=find_packages("./src"),
     long_description=description,
@@ -1,10 +1,89 @@
+import os
+import time
+import hashlib
+import weakref
+from concurrent.futures import ThreadPoolExecutor
+from collections import OrderedDict
+from datetime import datetime, timezone
+from threading import Lock
+from urllib.parse import urlparse, parse_qs
+
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+# optional HTTP/2 client for the Data API, needs `httpx` and `h2` (i.e., the extra `http2`)
+try:
+    import h2  # noqa: F401
+    import httpx
+except ImportError:
+    httpx = None
 
-from typing import Dict
+from typing import Dict, Optional, Tuple
 
 from dt_authentication import DuckietownToken
-from .constants import DATA_API_URL
-from .exceptions import APIError
+from .constants import (
+    DATA_API_URL,
+    HTTP_POOL_CONNECTIONS,
+    TRANSFER_POOL_MAX_WORKERS,
+    TRANSFER_BUF_SIZE_B,
+    TRANSFER_BUF_POOL_SIZE,
+    DOWNLOAD_WRITE_BUF_SIZE_B,
+    HTTP_POOL_MAXSIZE,
+    HTTP_MAX_RETRIES,
+    HTTP_RETRY_BACKOFF_FACTOR,
+    AUTHORIZED_URL_CACHE_SIZE,
+    VALIDATED_TOKENS_CACHE_SIZE,
+    AUTHORIZED_URL_EXPIRY_MARGIN_S,
+    AUTHORIZED_URL_CACHEABLE_ACTIONS,
+)
+from .exceptions import APIError, ConfigurationError
+from .utils import BufferPool, TransferHandler
+
+# user IDs of the tokens validated so far, indexed by the hash of the token (never the token itself)
+_validated_tokens: Dict[str, int] = OrderedDict()
+_validated_tokens_lock = Lock()
+# instances alive in this process, their threads and connections are replaced in forked children
+_instances: "weakref.WeakSet[DataAPI]" = weakref.WeakSet()
+
+
+def _after_fork_in_child():
+    global _validated_tokens_lock
+    _validated_tokens_lock = Lock()
+    for api in list(_instances):
+        api._after_fork()
+
+
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_after_fork_in_child)
+
+
+def _validate_token(token: str) -> int:
+    """
+    Validates a token and returns the ID of the user it belongs to. Verifying the signature of a
+    token is expensive, the outcome is remembered for the last few valid tokens.
+
+    Args:
+        token (:obj:`str`):     A Duckietown Token.
+
+    Returns:
+        int:    The ID of the user the token belongs to.
+
+    Raises:
+        dt_authentication.InvalidToken: The given token is not valid.
+    """
+    key = hashlib.sha256(token.encode("utf-8")).hexdigest()
+    with _validated_tokens_lock:
+        if key in _validated_tokens:
+            _validated_tokens.move_to_end(key)
+            return _validated_tokens[key]
+    # invalid tokens raise here and are never remembered
+    uid = DuckietownToken.from_string(token).uid
+    with _validated_tokens_lock:
+        _validated_tokens[key] = uid
+        while len(_validated_tokens) > VALIDATED_TOKENS_CACHE_SIZE:
+            _validated_tokens.popitem(last=False)
+    return uid
 
 
 class DataAPI(object):
@@ -15,19 +94,80 @@ class DataAPI(object):
     You should not use this class yourself, the DataClient will do it for you.
 
     Args:
-        token (:obj:`str`): you secret Duckietown Token
+        token (:obj:`str`):     you secret Duckietown Token
+        http2 (:obj:`bool`):    (Optional) Whether to talk to the Data API over HTTP/2, requires
+                                the extra ``http2`` (i.e., ``httpx`` and ``h2``).
 
     Raises:
         dt_authentication.InvalidToken: The given token is not valid.
+        dt_data_api.ConfigurationError: HTTP/2 is requested but ``httpx`` or ``h2`` is missing.
     """
 
-    def __init__(self, token: str):
+    def __init__(self, token: str, http2: bool = False):
+        if http2 and httpx is None:
+            raise ConfigurationError(
+                "HTTP/2 requires the packages 'httpx' and 'h2'. Install them with the extra 'http2'."
+            )
+        self._http2 = http2
         self._uid = None
         # validate the token
         if token is not None:
-            self._uid = DuckietownToken.from_string(token).uid
+            self._uid = _validate_token(token)
         # store the raw token
         self._token = token
+        # connections, threads and buffers, each process gets its own
+        self._setup()
+        # signed URLs already issued and still valid, in least recently used order
+        self._urls: Dict[Tuple, Tuple[str, float]] = OrderedDict()
+        self._urls_lock = Lock()
+        _instances.add(self)
+
+    def _setup(self):
+        """
+        Creates the HTTP session, the client to the Data API, the threads and the buffers shared by the
+        transfers.
+        """
+        # shared HTTP session, keeps connections to the API and the storage alive across requests
+        self._session = requests.Session()
+        # only idempotent methods are retried on read errors, PUT bodies are streamed and cannot
+        # be replayed
+        retries = Retry(
+            total=HTTP_MAX_RETRIES,
+            backoff_factor=HTTP_RETRY_BACKOFF_FACTOR,
+            allowed_methods=frozenset({"HEAD", "GET", "DELETE"}),
+        )
+        adapter = HTTPAdapter(
+            pool_connections=HTTP_POOL_CONNECTIONS, pool_maxsize=HTTP_POOL_MAXSIZE, max_retries=retries
+        )
+        self._session.mount("https://", adapter)
+        self._session.mount("http://", adapter)
+        # requests to the Data API are multiplexed over a single HTTP/2 connection when possible,
+        # the storage (S3) only speaks HTTP/1.1 and goes through the session above
+        self._api_client = None
+        if self._http2:
+            # no timeout, as with `requests`, and proxies are taken from the environment as well
+            self._api_client = httpx.Client(
+                http2=True, limits=httpx.Limits(max_connections=HTTP_POOL_MAXSIZE), timeout=None
+            )
+        # threads shared by all transfers, parts of any transfer run here
+        self._executor = ThreadPoolExecutor(
+            max_workers=TRANSFER_POOL_MAX_WORKERS, thread_name_prefix="dt-data-api"
+        )
+        # buffers shared by all transfers, data is read into them instead of newly allocated ones
+        self._buffers = BufferPool(
+            max(TRANSFER_BUF_SIZE_B, DOWNLOAD_WRITE_BUF_SIZE_B), TRANSFER_BUF_POOL_SIZE
+        )
+        # transfers running on the threads above, closing waits for them
+        self._transfers: "weakref.WeakSet[TransferHandler]" = weakref.WeakSet()
+        self._transfers_lock = Lock()
+
+    def _after_fork(self):
+        """
+        Replaces the threads and connections inherited from the parent process in a forked child.
+        The threads of the parent do not exist in the child, and its connections are not its own.
+        """
+        self._urls_lock = Lock()
+        self._setup()
 
     @property
     def uid(self) -> int:
@@ -39,6 +179,52 @@ class DataAPI(object):
         """The given token"""
         return self._token
 
+    @property
+    def session(self) -> requests.Session:
+        """The HTTP session shared by all the requests made to the API and the storage spaces"""
+        return self._session
+
+    @property
+    def executor(self) -> ThreadPoolExecutor:
+        """The pool of threads shared by all the transfers"""
+        return self._executor
+
+    @property
+    def buffers(self) -> BufferPool:
+        """The pool of buffers shared by all the transfers"""
+        return self._buffers
+
+    def register_transfer(self, handler: TransferHandler):
+        """
+        Registers a transfer running on the shared threads, :py:meth:`close` waits for it to end.
+
+        Args:
+            handler (:py:class:`dt_data_api.TransferHandler`): The handler of the transfer.
+        """
+        with self._transfers_lock:
+            self._transfers.add(handler)
+
+    def close(self, abort: bool = False):
+        """
+        Waits for the running transfers to complete and releases the shared threads and
+        connections. The object should not be used afterwards.
+
+        Args:
+            abort (:obj:`bool`):    (Optional) Whether to abort the running transfers instead of
+                                    waiting for them to complete.
+        """
+        with self._transfers_lock:
+            transfers = list(self._transfers)
+        # the transfers use the threads and the connections until they end
+        for handler in transfers:
+            if abort:
+                handler.abort()
+            handler.join()
+        self._executor.shutdown(wait=True)
+        self._session.close()
+        if self._api_client is not None:
+            self._api_client.close()
+
     def authorize_request(self, action: str, bucket: str, obj: str, headers: Dict[str, str] = None):
         """
         Authorizes the request to perform a given ``action`` on a given object ``obj``
@@ -60,12 +246,28 @@ class DataAPI(object):
         Raises:
             dt_data_api.APIError:       An error occurs while communicating with the DCSS.
         """
+        # reuse a signed URL issued earlier for the same request, if still valid
+        key = self._url_key(action, bucket, obj, headers)
+        with self._urls_lock:
+            now = time.time()
+            for k in [k for k, (_, expiry) in self._urls.items() if expiry <= now]:
+                del self._urls[k]
+            if key in self._urls:
+                self._urls.move_to_end(key)
+                return self._urls[key][0]
+        # ---
         api_url = DATA_API_URL.format(action=action, bucket=bucket, object=obj)
         api_headers = {"X-Duckietown-Token": self._token}
         if headers is not None:
             api_headers.update(headers)
         # request authorization
-        res = requests.get(api_url, headers=api_headers)
+        if self._api_client is not None:
+            try:
+                res = self._api_client.get(api_url, headers=api_headers)
+            except httpx.HTTPError as e:
+                raise APIError(f"API Error: {e}") from e
+        else:
+            res = self._session.get(api_url, headers=api_headers)
         if res.status_code != 200:
             raise APIError(f"API Error: Code: {res.status_code} Message: {res.text}")
         # parse answer
@@ -73,4 +275,59 @@ class DataAPI(object):
         if answer["code"] != 200:
             raise APIError(f'API Error: Code: {answer["code"]} Message: {answer["message"]}')
         # get signed url
-        return answer["data"]["url"]
+        url = answer["data"]["url"]
+        # cache signed url
+        expiry = self._url_expiry(url)
+        if action in AUTHORIZED_URL_CACHEABLE_ACTIONS and expiry is not None:
+            expiry -= AUTHORIZED_URL_EXPIRY_MARGIN_S
+            with self._urls_lock:
+                self._urls[key] = (url, expiry)
+                self._urls.move_to_end(key)
+                while len(self._urls) > AUTHORIZED_URL_CACHE_SIZE:
+                    self._urls.popitem(last=False)
+        return url
+
+    def invalidate(self, action: str, bucket: str, obj: str, headers: Dict[str, str] = None):
+        """
+        Forgets the signed URL issued for a request, if any, so that the next request is authorized
+        anew. Used when the storage rejects a URL before it expires (e.g., its credentials were
+        revoked).
+
+        Args:
+            action (:obj:`str`):        Action the URL was signed for.
+            bucket (:obj:`str`):        Name of the target storage space.
+            obj (:obj:`str`):           Path to the file the URL was signed for.
+            headers (:obj:`dict`):      Extra headers the URL was signed with.
+        """
+        with self._urls_lock:
+            self._urls.pop(self._url_key(action, bucket, obj, headers), None)
+
+    @staticmethod
+    def _url_key(action: str, bucket: str, obj: str, headers: Optional[Dict[str, str]]) -> Tuple:
+        """
+        Key of the signed URLs cache for a request.
+        """
+        return action, bucket, obj, tuple(sorted((headers or {}).items()))
+
+    @staticmethod
+    def _url_expiry(url: str) -> Optional[float]:
+        """
+        Extracts the expiration time from the query string of a signed URL.
+
+        Args:
+            url (:obj:`str`):           The signed URL.
+
+        Returns:
+            float:  The expiration time as a UNIX timestamp, or ``None`` if the URL does not
+                    carry one.
+        """
+        qs = parse_qs(urlparse(url).query)
+        try:
+            if "X-Amz-Date" in qs and "X-Amz-Expires" in qs:
+                signed = datetime.strptime(qs["X-Amz-Date"][0], "%Y%m%dT%H%M%SZ")
+                return signed.replace(tzinfo=timezone.utc).timestamp() + int(qs["X-Amz-Expires"][0])
+            if "Expires" in qs:
+                return float(qs["Expires"][0])
+        except ValueError:
+            pass
+        return None
@@ -12,14 +12,17 @@ class DataClient(object):
 
     Args:
         token (:obj:`str`):         your secret Duckietown Token
+        http2 (:obj:`bool`):        (Optional) Whether to talk to the Data API over HTTP/2,
+                                    requires the extra ``http2`` (i.e., ``httpx`` and ``h2``)
 
     Raises:
         dt_authentication.InvalidToken: The given token is not valid.
+        dt_data_api.ConfigurationError: HTTP/2 is requested but ``httpx`` or ``h2`` is missing.
 
     """
 
-    def __init__(self, token: str = None):
-        self._api = DataAPI(token)
+    def __init__(self, token: str = None, http2: bool = False):
+        self._api = DataAPI(token, http2=http2)
 
     @property
     def api(self):
@@ -28,6 +31,24 @@ class DataClient(object):
         """
         return self._api
 
+    def close(self, abort: bool = False):
+        """
+        Waits for the running transfers to complete and releases the threads and connections
+        used by this client. The client should not be used afterwards.
+
+        Args:
+            abort (:obj:`bool`):    (Optional) Whether to abort the running transfers instead of
+                                    waiting for them to complete.
+        """
+        self._api.close(abort=abort)
+
+    def __enter__(self) -> "DataClient":
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        # leaving on an error (e.g., KeyboardInterrupt) stops the transfers instead of waiting for them
+        self.close(abort=exc_type is not None)
+
     def storage(self, name: str, impersonate: Union[None, int] = None) -> Storage:
         """
         Creates a :py:class:`dt_data_api.Storage` that interfaces to a specific storage
@@ -3,4 +3,27 @@ BUCKET_NAME = "duckietown-{name}-storage"
 MAXIMUM_ALLOWED_SIZE = 5368709120
 DATA_API_VERSION = "v1"
 DATA_API_URL = "https://data.duckietown.org/%s/{action}/{bucket}/{object}" % DATA_API_VERSION
-TRANSFER_BUF_SIZE_B = 1024**2
+TRANSFER_BUF_SIZE_B = 4 * 1024**2
+TRANSFER_MIN_BUF_SIZE_B = 256 * 1024
+TRANSFER_BUF_GROWTH_THRESHOLD_BPS = 50 * 1000**2
+TRANSFER_THROUGHPUT_WINDOW_S = 1.0
+TRANSFER_MAX_PARALLEL_PARTS = 8
+TRANSFER_POOL_MAX_WORKERS = 32
+TRANSFER_JOBS_MAX_WORKERS = 32
+TRANSFER_BUF_POOL_SIZE = 8
+PROGRESS_FIRE_INTERVAL_S = 0.05
+PROGRESS_SPEED_WINDOW_S = 3.0
+DOWNLOAD_JOURNAL_EXT = ".dtresume"
+DOWNLOAD_SEGMENT_SIZE_B = 64 * 1024**2
+DOWNLOAD_WRITE_BUF_SIZE_B = 8 * 1024**2
+DOWNLOAD_DROP_CACHE_MIN_SIZE_B = 256 * 1024**2
+METADATA_MAX_PARALLEL_REQUESTS = 16
+PARTS_CACHE_SIZE = 256
+HTTP_POOL_CONNECTIONS = 16
+HTTP_POOL_MAXSIZE = 32
+HTTP_MAX_RETRIES = 3
+HTTP_RETRY_BACKOFF_FACTOR = 0.2
+AUTHORIZED_URL_CACHE_SIZE = 256
+VALIDATED_TOKENS_CACHE_SIZE = 32
+AUTHORIZED_URL_EXPIRY_MARGIN_S = 60
+AUTHORIZED_URL_CACHEABLE_ACTIONS = {"head_object", "get_object", "put_object", "list_objects_v2"}
@@ -1,8 +1,11 @@
 import dataclasses
 from datetime import datetime
-from typing import Any
+from email.utils import parsedate_to_datetime
+from typing import Any, Dict, Optional
 
 LAST_MODIFIED_FORMAT = "%Y-%m-%dT%H:%M:%S.000Z"
+# size of the objects whose headers do not report it (e.g., chunked responses)
+UNKNOWN_SIZE = -1
 
 
 @dataclasses.dataclass
@@ -17,14 +20,17 @@ class Item:
         <StorageClass>STANDARD</StorageClass>
 
     """
+
     key: str
     last_modified: datetime
     etag: str
     size: int
     storage_class: str
+    # listings do not report it, only the headers of the object do
+    content_encoding: str = "identity"
 
     @staticmethod
-    def parse_obj(obj) -> 'Item':
+    def parse_obj(obj) -> "Item":
         d: dict = _object_to_dict(obj)
         return Item(
             key=d["Key"],
@@ -34,6 +40,27 @@ class Item:
             storage_class=d["StorageClass"],
         )
 
+    @staticmethod
+    def parse_headers(key: str, headers: Dict[str, str]) -> "Item":
+        # not every response carries all the headers (e.g., some proxies or S3-compatible servers)
+        length = headers.get("Content-Length")
+        return Item(
+            key=key,
+            last_modified=_parse_http_date(headers.get("Last-Modified")),
+            etag=headers.get("ETag", "").strip('"'),
+            size=int(length) if length is not None else UNKNOWN_SIZE,
+            storage_class=headers.get("x-amz-storage-class", "STANDARD"),
+            content_encoding=headers.get("Content-Encoding", "identity"),
+        )
+
+
+def _parse_http_date(value: Optional[str]) -> datetime:
+    # HTTP dates are always in English and GMT, naive as the ones from the listings
+    try:
+        return parsedate_to_datetime(value).replace(tzinfo=None)
+    except (TypeError, ValueError):
+        return datetime.min
+
 
 def _object_to_dict(obj: Any) -> dict:
     d: dict = {}
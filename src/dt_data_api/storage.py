@@ -1,30 +1,71 @@
 import os
 import io
+import json
+import mmap
+import stat
+import dataclasses
+import asyncio
+import weakref
+from contextlib import suppress
 from functools import partial
+from itertools import accumulate
+from collections import OrderedDict
+from threading import Lock
+from urllib.parse import quote
 
 import requests
 from bs4 import BeautifulSoup
 
-from typing import Union, BinaryIO, Dict, List, Optional, overload, Literal
-
-from dt_authentication import DuckietownToken
+from typing import Union, BinaryIO, Dict, List, Optional, Tuple, overload, Literal, Callable, Any
 
 from . import logger
 from .api import DataAPI
 from .utils import (
-    IterableIO,
-    MonitoredIOIterator,
+    PartReader,
     MultipartBytesIO,
+    RangedStream,
     TransferProgress,
     WorkerThread,
     TransferHandler,
     TransferStatus,
     BytesBuffer,
+    pwrite,
+    preallocate,
+    drop_cache,
+    iter_response,
+    ChunkSizer,
+    Prefetcher,
+    run_bounded,
+)
+from .item import Item, UNKNOWN_SIZE
+from .constants import (
+    BUCKET_NAME,
+    DOWNLOAD_JOURNAL_EXT,
+    DOWNLOAD_SEGMENT_SIZE_B,
+    DOWNLOAD_DROP_CACHE_MIN_SIZE_B,
+    DOWNLOAD_WRITE_BUF_SIZE_B,
+    PUBLIC_STORAGE_URL,
+    MAXIMUM_ALLOWED_SIZE,
+    METADATA_MAX_PARALLEL_REQUESTS,
+    PARTS_CACHE_SIZE,
+    TRANSFER_BUF_SIZE_B,
+    TRANSFER_MIN_BUF_SIZE_B,
+    TRANSFER_MAX_PARALLEL_PARTS,
 )
-from .item import Item
-from .constants import BUCKET_NAME, PUBLIC_STORAGE_URL, TRANSFER_BUF_SIZE_B
 from .exceptions import TransferError, TransferAborted, APIError
 
+# instances alive in this process, their locks are replaced in forked children
+_instances: "weakref.WeakSet[Storage]" = weakref.WeakSet()
+
+
+def _after_fork_in_child():
+    for storage in list(_instances):
+        storage._after_fork()
+
+
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_after_fork_in_child)
+
 
 class Storage(object):
     """
@@ -44,6 +85,19 @@ class Storage(object):
         self._api = api
         self._name = name
         self._full_name = BUCKET_NAME.format(name=name)
+        # chunk size last picked by a download, new parts start from it instead of ramping up again
+        self._chunk_size = TRANSFER_MIN_BUF_SIZE_B
+        # ETag of the first part, parts and encoding of the multipart objects seen so far
+        self._parts_cache: Dict[str, Tuple[str, List[str], str]] = OrderedDict()
+        self._parts_cache_lock = Lock()
+        _instances.add(self)
+
+    def _after_fork(self):
+        """
+        Replaces the lock inherited from the parent process in a forked child, a thread of the
+        parent might have held it at the time of the fork.
+        """
+        self._parts_cache_lock = Lock()
 
     @property
     def api(self) -> DataAPI:
@@ -82,7 +136,7 @@ class Storage(object):
         # public storages are publicly accessible
         if self._name == "public":
             # anybody can do this
-            qs = f"?prefix={prefix}"
+            qs = f"?prefix={quote(prefix)}"
             url = PUBLIC_STORAGE_URL.format(bucket=self._name, object=qs)
         else:
             # you need permission for this, authorize request
@@ -90,9 +144,10 @@ class Storage(object):
             url = self._api.authorize_request("list_objects_v2", self._full_name, prefix)
         # send request
         try:
-            res = requests.get(url)
+            res = self._api.session.get(url)
         except requests.exceptions.ConnectionError as e:
             raise TransferError(e)
+        self._check_signed_url(res, "list_objects_v2", prefix)
         # parse output
         soup = BeautifulSoup(res.text, "xml")
         # extract objects
@@ -134,9 +189,10 @@ class Storage(object):
             url = self._api.authorize_request("head_object", self._full_name, obj)
         # send request
         try:
-            res = requests.head(url)
+            res = self._api.session.head(url)
         except requests.exceptions.ConnectionError as e:
             raise TransferError(e)
+        self._check_signed_url(res, "head_object", obj)
         # check output
         if res.status_code == 404:
             raise FileNotFoundError(f"Object '{obj}' not found")
@@ -166,22 +222,38 @@ class Storage(object):
         url = self._api.authorize_request("delete_object", self._full_name, obj)
         # send request
         try:
-            res = requests.delete(url)
+            res = self._api.session.delete(url)
         except requests.exceptions.ConnectionError as e:
             raise TransferError(e)
+        self._check_signed_url(res, "delete_object", obj)
         # ---
         return res.status_code in [200, 204]
 
     def download(
-        self, source: str, destination: Optional[str] = None, force: bool = False
+        self,
+        source: str,
+        destination: Optional[str] = None,
+        force: bool = False,
+        resume: bool = False,
+        max_parallel_parts: int = TRANSFER_MAX_PARALLEL_PARTS,
     ) -> TransferHandler:
         """
         Downloads a file from the storage space.
+        Parts of the object (and segments of large parts) are downloaded in parallel.
 
         Args:
-            source:         The path to the file to download in the storage space.
-            destination:    The local path the file is downloaded to.
-            force:          Whether the destination file is overwritten in case it exists.
+            source:                 The path to the file to download in the storage space.
+            destination:            The local path the file is downloaded to.
+            force:                  Whether the destination file is overwritten in case it exists.
+            resume:                 Whether to resume a previous (interrupted) download to the same
+                                    `destination` instead of starting over. Only the missing bytes
+                                    are downloaded. The progress is only recorded when this is set,
+                                    pass it to the first attempt as well. Existing files that are
+                                    not a partial download of the object are only overwritten
+                                    with `force`. Encoded (e.g., compressed) objects cannot be
+                                    resumed.
+            max_parallel_parts:     (Optional) Maximum number of parts (or segments) downloaded at
+                                    the same time.
 
         Returns:
             TransferHandler:    An handler to the transfer operation.
@@ -193,116 +265,319 @@ class Storage(object):
 
         """
         source = self._sanitize_remote_path(source)
-        parts = self._get_parts(source)
         to_disk = isinstance(destination, str)
         if not to_disk:
+            if resume:
+                raise ValueError("Only downloads to disk can be resumed, `destination` must be a path.")
             destination = BytesBuffer()
-        # check destination
-        if to_disk and os.path.exists(destination):
-            if os.path.isdir(destination):
+        # check destination, a single stat tells whether it exists, what it is and its size
+        existing = None
+        if to_disk:
+            with suppress(OSError):
+                existing = os.stat(destination)
+        # a partial download to resume is a regular file
+        resumable = resume and existing is not None and stat.S_ISREG(existing.st_mode)
+        if existing is not None:
+            if stat.S_ISDIR(existing.st_mode):
                 raise ValueError(f"The path '{destination}' already exists and is a directory.")
-            if not force:
+            # only a file with a journal is a partial download, any other file is never replaced
+            # without `force`
+            partial_download = resumable and os.path.isfile(f"{destination}{DOWNLOAD_JOURNAL_EXT}")
+            if not force and not partial_download:
                 raise ValueError(
-                    f"The destination file '{destination}' already exists. Use "
-                    f"`force=True` to overwrite it."
+                    f"The destination file '{destination}' already exists. Use `force=True` to "
+                    f"overwrite it, or `resume=True` to resume a download started with `resume=True`."
                 )
-        # get parts metadata
-        metas = [self.head(part) for part in parts]
-        obj_length = sum([int(r["Content-Length"]) for r in metas])
+        if max_parallel_parts < 1:
+            raise ValueError("The argument `max_parallel_parts` must be a positive number.")
+        # resolve how to get the url to a part once
+        if self._name == "public":
+            # anybody can do this
+            url_for_part = lambda p: PUBLIC_STORAGE_URL.format(bucket=self._name, object=p)
+        else:
+            # you need permission for this, authorize requests
+            self._check_token(f"Storage[{self._name}].download(...)")
+            url_for_part = partial(self._api.authorize_request, "get_object", self._full_name)
+        # most objects have a single part, try to get it right away, its headers tell us its size
+        # and the same response streams its content, unless the object is known to have many parts
+        peeked = []
+        with self._parts_cache_lock:
+            multipart = source in self._parts_cache
+        if not multipart and not resumable:
+            peek = self._peek_object(source, url_for_part)
+            if peek is not None:
+                item, res = peek
+                items = [item]
+                peeked.append(res)
+        if not peeked:
+            items = self._get_parts(source)
+        parts = [item.key for item in items]
+        lengths = [item.size for item in items]
+        # compute the position of each part within the destination
+        offsets = list(accumulate([0] + lengths[:-1]))
+        obj_length = sum(lengths)
+        # an encoded (e.g., gzip-compressed) object is decoded on the fly, the size of its decoded
+        # parts is not known upfront, so they are downloaded whole, one after the other, and cannot
+        # be resumed
+        encoded = any(item.content_encoding != "identity" for item in items)
+        # large parts are split into segments, downloaded in parallel with ranged requests
+        if encoded:
+            segments = [(i, 0, length) for i, length in enumerate(lengths)]
+        else:
+            segments = self._split_parts(lengths)
+        seg_offsets = [offsets[i] + start for i, start, _ in segments]
+        # number of bytes of each segment already in the destination (received, if encoded), they
+        # are tracked in a journal next to the destination, only when the download can be resumed
+        journal = f"{destination}{DOWNLOAD_JOURNAL_EXT}" if to_disk and resume and not encoded else None
+        done = [0] * len(segments)
+        # end of the decoded content written so far
+        decoded = [0]
+        if resumable:
+            loaded = self._load_download_journal(journal, items, segments) if journal else None
+            # a journal that does not match the object (e.g., it changed in the meantime) means
+            # the destination holds something else, it is only replaced with `force`
+            if loaded is None and not force:
+                raise ValueError(
+                    f"The destination file '{destination}' already exists and it is not a partial "
+                    f"download of '{source}'. Use `force=True` to overwrite it."
+                )
+            done = loaded or done
+        journal_lock = Lock()
+        # signed URLs to the parts are requested one window of segments ahead
+        signer = Prefetcher(self._api.executor, url_for_part)
         # create a transfer handler
-        progress = TransferProgress(obj_length, parts=len(parts))
+        progress = TransferProgress(obj_length, transferred=sum(done), parts=len(parts))
         handler = TransferHandler(progress)
         if not to_disk:
             handler.buffer = destination
         # set status to READY
         handler.set_status(TransferStatus.READY, "Worker created")
-        # create fp object
-        fp = partial(open, destination, "wb") if to_disk else destination.fp
 
         # clean up job
         def clean_up():
             if to_disk and os.path.exists(destination) and os.path.isfile(destination):
                 os.remove(destination)
+            if journal and os.path.isfile(journal):
+                os.remove(journal)
             if not to_disk:
                 destination.truncate(0)
 
-        # define downloading job
-        def job(worker: WorkerThread, *_, **__):
-            # set status to ACTIVE
-            handler.set_status(TransferStatus.ACTIVE, "Worker started")
-            # open destination
-            with fp() as fout:
-                # download parts
-                for i, part in enumerate(parts):
-                    # check worker
-                    if worker.is_shutdown:
-                        logger.debug("Transfer aborted!")
-                        # set status to STOPPED
-                        handler.set_status(TransferStatus.STOPPED, "Worker was stopped")
-                        # clean up partial files
-                        clean_up()
-                        # tell the server we are done
-                        res.close()
-                        # get out of here
-                        return
-                    # ---
-                    # update progress
-                    progress.update(part=i + 1)
-                    # get url to part
-                    if self._name == "public":
-                        # anybody can do this
-                        url = PUBLIC_STORAGE_URL.format(bucket=self._name, object=part)
-                    else:
-                        # you need permission for this, authorize request
-                        self._check_token(f"Storage[{self._name}].download(...)")
-                        try:
-                            url = self._api.authorize_request("get_object", self._full_name, part)
-                        except APIError as e:
-                            # set status to ERROR
-                            handler.set_status(TransferStatus.ERROR, str(e))
-                            return
-                    # send request
-                    res = requests.get(url, stream=True)
-                    # stream content
-                    for chunk in res.iter_content(TRANSFER_BUF_SIZE_B):
+        # resume journal, records how much of each segment made it to disk
+        def save_journal():
+            if journal:
+                with journal_lock:
+                    self._save_download_journal(journal, items, segments, done)
+
+        # define segment downloading job
+        def download_segment(
+            worker: WorkerThread,
+            s: int,
+            write: Callable[[bytes, int], Any],
+            release: Optional[Callable[[int, int], Any]] = None,
+        ):
+            i, start, length = segments[s]
+            # sign the URL to the part starting a window ahead, so that it is ready once its turn comes
+            ahead = s + max_parallel_parts
+            if self._name != "public" and ahead < len(segments) and segments[ahead][1] == 0:
+                signer.prefetch(parts[segments[ahead][0]])
+            # skip segments already downloaded
+            if done[s] >= length:
+                return
+            # update progress
+            progress.update(part=max(progress.part, i + 1))
+            expected = 200
+            if s == 0 and peeked:
+                # the request for the whole first part was already sent
+                res = peeked.pop()
+            else:
+                # get url to part
+                url = signer.get(parts[i])
+                # send request, only for the missing bytes of the segment
+                headers = None
+                if done[s] or length < lengths[i]:
+                    # ranges are offsets within the stored bytes, they must not come back compressed
+                    headers = {
+                        "Range": f"bytes={start + done[s]}-{start + length - 1}",
+                        "Accept-Encoding": "identity",
+                    }
+                    expected = 206
+                res = self._api.session.get(url, headers=headers, stream=True)
+            # the response is closed (or its connection given back to the pool) once done
+            with res:
+                self._check_signed_url(res, "get_object", parts[i])
+                if res.status_code != expected:
+                    raise TransferError(f"Transfer Error: Code: {res.status_code} Message: {res.text}")
+                if not encoded and res.headers.get("Content-Encoding", "identity") != "identity":
+                    raise TransferError(
+                        f"Transfer Error: The object '{source}' is encoded, it cannot be downloaded in "
+                        f"segments or resumed. Download it again with `resume=False`."
+                    )
+                # stream content to the segment's region of the destination
+                offset = seg_offsets[s] + done[s]
+                sizer = ChunkSizer(self._chunk_size, TRANSFER_BUF_SIZE_B)
+                try:
+                    chunks = iter_response(
+                        res, sizer=sizer, coalesce=DOWNLOAD_WRITE_BUF_SIZE_B, pool=self._api.buffers
+                    )
+                    for chunk in chunks:
                         # check worker
                         if worker.is_shutdown:
-                            logger.debug("Transfer aborted!")
-                            # set status to STOPPED
-                            handler.set_status(TransferStatus.STOPPED, "Worker was stopped")
-                            # clean up partial files
-                            clean_up()
-                            # tell the server we are done
-                            res.close()
-                            # get out of here
                             return
                         # ---
-                        fout.write(chunk)
+                        if encoded:
+                            # decoded content is appended, progress counts the bytes received
+                            write(chunk, decoded[0])
+                            decoded[0] += len(chunk)
+                            received = res.raw.tell() - done[s]
+                        else:
+                            # a response for the whole part runs past the end of its first segment
+                            chunk = chunk[: length - done[s]]
+                            write(chunk, offset)
+                            offset += len(chunk)
+                            received = len(chunk)
+                        done[s] += received
                         # update progress
-                        progress.update(transferred=progress.transferred + len(chunk))
+                        progress.update(delta_transferred=received)
+                        # ---
+                        if not encoded and done[s] >= length:
+                            break
+                finally:
+                    # let the next parts start from where this one got to
+                    self._chunk_size = sizer.size
+            # a body shorter than the segment would leave a hole in the destination
+            if done[s] < length:
+                raise TransferError(
+                    f"Transfer Error: Received {done[s]} of the {length} bytes expected for part "
+                    f"'{parts[i]}' (at {start})."
+                )
+            # the segment is complete, its pages do not need to stay in memory
+            if release is not None and not encoded:
+                release(seg_offsets[s], length)
+            # record the progress
+            save_journal()
+
+        # define downloading job
+        def job(worker: WorkerThread, *_, **__):
+            try:
+                transfer(worker)
+            finally:
+                # the response to the first request is not needed if the first part was never reached
+                for res in peeked:
+                    res.close()
+
+        def transfer(worker: WorkerThread):
+            # set status to ACTIVE
+            handler.set_status(TransferStatus.ACTIVE, "Worker started")
+            error = None
+            fd = None
+            release = None
+            try:
+                if to_disk:
+                    # open destination, keep its content when resuming
+                    save_journal()
+                    flags = os.O_WRONLY | os.O_CREAT | (0 if any(done) else os.O_TRUNC)
+                    fd = os.open(destination, flags, 0o644)
+                    # large files go through the page cache without pushing the data of others out
+                    if obj_length >= DOWNLOAD_DROP_CACHE_MIN_SIZE_B:
+                        release = partial(drop_cache, fd)
+                    # parts are written at their own offset, allocate the whole file upfront
+                    if not encoded:
+                        preallocate(fd, obj_length)
+                    write = partial(pwrite, fd)
+                else:
+                    write = destination.pwrite
+                # download segments in parallel on the shared threads, stop the others on error
+                run_bounded(
+                    self._api.executor,
+                    (
+                        partial(download_segment, worker, s, write, release)
+                        for s in range(len(segments))
+                        # nothing left to start once the transfer is aborted
+                        if not worker.is_shutdown
+                    ),
+                    1 if encoded else max_parallel_parts,
+                    on_error=lambda _: worker.shutdown(),
+                )
+            # a RuntimeError means the client was closed, the shared threads are gone
+            except (
+                APIError,
+                TransferError,
+                requests.exceptions.RequestException,
+                OSError,
+                RuntimeError,
+            ) as e:
+                error = e
+            finally:
+                if fd is not None:
+                    # the writes of the early segments are on disk by now, their pages can go
+                    if release is not None:
+                        release(0, 0)
+                    os.close(fd)
+            # ---
+            if error is not None and fd is not None:
+                if journal:
+                    # keep what was downloaded so far, the download can be resumed
+                    with suppress(OSError):
+                        save_journal()
+                else:
+                    # without a journal, a partial (preallocated) file would look complete to a resume
+                    clean_up()
+            if error is not None:
+                # set status to ERROR
+                handler.set_status(TransferStatus.ERROR, str(error))
+                logger.debug("ERROR: %s", error)
+                return
+            if worker.is_shutdown:
+                logger.debug("Transfer aborted!")
+                # set status to STOPPED
+                handler.set_status(TransferStatus.STOPPED, "Worker was stopped")
+                if journal:
+                    # keep what was downloaded so far, the download can be resumed
+                    save_journal()
+                else:
+                    # clean up partial files
+                    clean_up()
+                return
+            # the download is complete, the journal is not needed anymore
+            if journal and os.path.isfile(journal):
+                os.remove(journal)
+            # set status to FINISHED
+            handler.set_status(TransferStatus.FINISHED, "Finished")
 
         # create a worker
         worker_th = WorkerThread(job)
         # register worker with the handler
         handler.add_worker(worker_th)
+        # closing the client waits for the transfer
+        self._api.register_transfer(handler)
         # start the worker
         worker_th.start()
         # return transfer handler
         return handler
 
     def upload(
-        self, source: Union[str, bytes, BinaryIO], destination: str, length: int = None
+        self,
+        source: Union[str, bytes, bytearray, memoryview, BinaryIO],
+        destination: str,
+        length: int = None,
+        part_size: int = None,
+        max_parallel_parts: int = TRANSFER_MAX_PARALLEL_PARTS,
     ) -> TransferHandler:
         """
         Uploads a file to the storage space.
 
         Args:
-            source:         `str` - The local path of the file to upload.\n
-                            `bytes` - Content of the file as `bytes` object.\n
-                            `BinaryIO` - A file-like object.
-            destination:    The path to the resulting file in the storage space.
-            length:         (Optional) Length of the data in bytes. Only needed when `source`
-                            is of type `BinaryIO`.
+            source:                 `str` - The local path of the file to upload.\n
+                                    `bytes` - Content of the file as `bytes`-like object.\n
+                                    `BinaryIO` - A file-like object.
+            destination:            The path to the resulting file in the storage space.
+            length:                 (Optional) Length of the data in bytes. Only needed when
+                                    `source` is of type `BinaryIO`.
+            part_size:              (Optional) Size in bytes of the parts the data is split into.
+                                    Data larger than this is stored as a multipart object, with
+                                    its parts uploaded in parallel. By default, data up to the
+                                    maximum size of an object is stored as a single object.
+            max_parallel_parts:     (Optional) Maximum number of parts uploaded at the same time.
 
         Returns:
             TransferHandler:    An handler to the transfer operation.
@@ -312,17 +587,23 @@ class Storage(object):
             dt_data_api.TransferError:  An error occurs while transferring the data to the DCSS.
 
         """
+        file_path = None
         if isinstance(source, str):
             file_path = os.path.abspath(source)
-            if not os.path.isfile(file_path):
+            # a single stat tells whether the file exists and its size
+            try:
+                source_stat = os.stat(file_path)
+            except OSError:
+                source_stat = None
+            if source_stat is None or not stat.S_ISREG(source_stat.st_mode):
                 raise ValueError(f"The file {file_path} does not exist.")
-            source = open(file_path, "rb")
-            source_len = os.path.getsize(file_path)
-        elif isinstance(source, bytes):
+            source_len = source_stat.st_size
+        elif isinstance(source, (bytes, bytearray, memoryview)):
+            # parts are slices of the data, nothing is copied and they can be read concurrently
+            source = memoryview(source).cast("B")
             source_len = len(source)
-            source = io.BytesIO(source)
-        elif isinstance(source, io.RawIOBase):
-            if length is None or 0 < length:
+        elif isinstance(source, (io.RawIOBase, io.BufferedIOBase)):
+            if length is None or length < 0:
                 raise ValueError(
                     "When `source` is a file-like object, the stream `length` "
                     "must be explicitly provided (as number of bytes)."
@@ -333,102 +614,307 @@ class Storage(object):
                 f"Source object must be either a string (file path), a bytes object "
                 f"or a binary stream, got {str(type(source))} instead."
             )
+        # multipart objects are opt-in, not every reader of the storage knows how to put them together
+        if part_size is None:
+            part_size = MAXIMUM_ALLOWED_SIZE
+        if not 0 < part_size <= MAXIMUM_ALLOWED_SIZE:
+            raise ValueError(f"The argument `part_size` must be in the range (0, {MAXIMUM_ALLOWED_SIZE}].")
+        if max_parallel_parts < 1:
+            raise ValueError("The argument `max_parallel_parts` must be a positive number.")
+        # you need permission for this
+        self._check_token(f"Storage[{self._name}].upload(...)")
         # prepare owner information
         owner = {"id": "0"}
-        if self._api.token is not None:
-            token = DuckietownToken.from_string(self._api.token)
-            owner["id"] = str(token.uid)
+        if self._api.uid is not None:
+            # the token was validated when the client was created
+            owner["id"] = str(self._api.uid)
+        # sanitize destination
+        destination = self._sanitize_remote_path(destination)
         # ---
+        # map the file in memory once all the arguments are checked, parts are sent straight from
+        # the page cache
+        mapping = None
+        if file_path is not None:
+            mapping = self._map_file(file_path, source_len)
+            source = memoryview(mapping) if mapping is not None else memoryview(b"")
         # create a multipart handler
-        parts = MultipartBytesIO(source, source_len)
+        parts = MultipartBytesIO(source, source_len, part_size)
         num_parts = parts.number_of_parts()
+        # the parts of a stream that cannot seek (e.g., a pipe) can only be read one at a time
+        if parts.sequential:
+            max_parallel_parts = 1
         # create a transfer progress handler
-        progress = TransferProgress(total=source_len, parts=num_parts)
+        progress = TransferProgress(total=source_len, parts=num_parts, part_size=part_size)
         # create a transfer handler
         handler = TransferHandler(progress)
-        # create a monitored iterator
-        monitor = MonitoredIOIterator(progress)
-        # sanitize destination
-        destination = self._sanitize_remote_path(destination)
-        # create destination format
-        destination_fmt = lambda p: destination + (f".{p:03d}" if num_parts > 1 else "")
+        # name the parts once
+        dest_parts = [f"{destination}.{p:03d}" for p in range(num_parts)] if num_parts > 1 else [destination]
+        # round up metadata
+        metadata = {
+            "x-amz-meta-number-of-parts": str(num_parts),
+            **{f"x-amz-meta-owner-{k}": v for k, v in owner.items()},
+        }
         # set status to READY
         handler.set_status(TransferStatus.READY, "Worker created")
+        authorize_part = partial(self._api.authorize_request, "put_object", self._full_name, headers=metadata)
+        # signed URLs to the parts are requested one window of parts ahead
+        signer = Prefetcher(self._api.executor, authorize_part)
+
+        # define part uploading job
+        def upload_part(
+            worker: WorkerThread, part: int, stream_len: int, stream: Union[RangedStream, memoryview]
+        ):
+            dest_part = dest_parts[part]
+            # create a monitored reader, the flow of data is interrupted when the worker is stopped
+            data = b""
+            if stream_len:
+                data = PartReader(stream, stream_len, progress, worker, pool=self._api.buffers)
+            try:
+                # update progress
+                progress.update(part=max(progress.part, part + 1))
+                # sign the URL to the part a window ahead, so that it is ready once its turn comes
+                if part + max_parallel_parts < num_parts:
+                    signer.prefetch(dest_parts[part + max_parallel_parts])
+                # authorize request
+                url = signer.get(dest_part)
+                # send request through the shared session, the reader has a length, so `requests`
+                # sends it with a `Content-Length` header instead of chunked transfer encoding
+                res = self._api.session.put(url, data=data, headers=metadata)
+            finally:
+                # the chunk being sent when the request failed (if any) is not needed anymore
+                if isinstance(data, PartReader):
+                    data.close()
+            # parse response
+            self._check_signed_url(res, "put_object", dest_part, metadata)
+            if res.status_code != 200:
+                raise TransferError(f"Transfer Error: Code: {res.status_code} Message: {res.text}")
 
         # define uploading job
         def job(worker: WorkerThread, *_, **__):
             # set status to ACTIVE
             handler.set_status(TransferStatus.ACTIVE, "Worker started")
-            # iterate over the parts
-            for part, (stream_len, stream) in enumerate(parts):
-                if worker.is_shutdown:
-                    logger.debug("Transfer aborted!")
-                    return
-                # ---
-                dest_part = destination_fmt(part)
-                monitor.set_iterator(iter(IterableIO(stream)))
-                # update progress
-                progress.update(part=part + 1)
-                # round up metadata
-                metadata = {
-                    "x-amz-meta-number-of-parts": str(num_parts),
-                    **{f"x-amz-meta-owner-{k}": v for k, v in owner.items()},
-                }
-                # authorize request
-                self._check_token(f"Storage[{self._name}].upload(...)")
-                try:
-                    url = self._api.authorize_request(
-                        "put_object", self._full_name, dest_part, headers=metadata
-                    )
-                except APIError as e:
-                    # set status to ERROR
-                    handler.set_status(TransferStatus.ERROR, str(e))
-                    return
-                # prepare request
-                req = requests.Request("PUT", url, data=monitor).prepare()
-                # remove header 'Transfer-Encoding'
-                del req.headers["Transfer-Encoding"]
-                # add header 'Content-Length'
-                req.headers["Content-Length"] = stream_len
-                # add metadata
-                req.headers.update(metadata)
-                # send request
-                try:
-                    # open a session
-                    session = requests.Session()
-                    # send request through the session
-                    res = session.send(req)
-                except requests.exceptions.ConnectionError as e:
-                    # set status to ERROR
-                    handler.set_status(TransferStatus.ERROR, str(e))
-                    logger.debug(f"ERROR: {str(e)}")
-                    return
-                except TransferAborted:
-                    # set status to ERROR
-                    handler.set_status(TransferStatus.STOPPED, "Worker was stopped")
-                    logger.debug("Worker was stopped!")
-                    return
-                # parse response
-                if res.status_code != 200:
-                    # set status to ERROR
-                    handler.set_status(TransferStatus.ERROR, res.text)
-                    logger.debug(f"Transfer Error: Code: {res.status_code} Message: {res.text}")
-                    return
-                # set status to FINISHED
-                handler.set_status(TransferStatus.FINISHED, "Finished")
+            error = None
+            # upload parts in parallel on the shared threads, stop the other parts on error
+            try:
+                run_bounded(
+                    self._api.executor,
+                    (
+                        partial(upload_part, worker, part, stream_len, stream)
+                        for part, (stream_len, stream) in enumerate(parts)
+                        # nothing left to start once the transfer is aborted
+                        if not worker.is_shutdown
+                    ),
+                    max_parallel_parts,
+                    on_error=lambda _: worker.shutdown(),
+                )
+            except TransferAborted:
+                pass
+            # a RuntimeError means the client was closed, the shared threads are gone
+            except (APIError, TransferError, requests.exceptions.RequestException, RuntimeError) as e:
+                error = e
+            finally:
+                # every part returned, their slices of the data are released (even those a traceback
+                # still holds), after that nothing views the mapped file anymore
+                parts.close()
+                if mapping is not None:
+                    source.release()
+                    mapping.close()
+            # ---
+            if error is not None:
+                # set status to ERROR
+                handler.set_status(TransferStatus.ERROR, str(error))
+                logger.debug("ERROR: %s", error)
+                return
+            if worker.is_shutdown:
+                # set status to STOPPED
+                handler.set_status(TransferStatus.STOPPED, "Worker was stopped")
+                logger.debug("Worker was stopped!")
+                return
+            # set status to FINISHED
+            handler.set_status(TransferStatus.FINISHED, "Finished")
 
         # create a worker
         worker_th = WorkerThread(job)
         # register worker with the handler
         handler.add_worker(worker_th)
-        # give the worker to the iterator monitor so that the flow of data can be interrupted
-        # when the worker is stopped
-        monitor.set_worker(worker_th)
-        # start the worker
-        worker_th.start()
+        # closing the client waits for the transfer
+        self._api.register_transfer(handler)
+        # start the worker, the mapped file is released by the job from now on
+        try:
+            worker_th.start()
+        except BaseException:
+            if mapping is not None:
+                source.release()
+                mapping.close()
+            raise
         # return transfer handler
         return handler
 
+    @staticmethod
+    def _map_file(file_path: str, length: int) -> Optional[mmap.mmap]:
+        """
+        Maps a file in memory for reading it front to back.
+
+        Args:
+            file_path:  Path to the file.
+            length:     Size of the file in bytes.
+
+        Returns:
+            mmap.mmap:  The read-only mapping, or ``None`` for empty files (they cannot be mapped).
+        """
+        if length <= 0:
+            return None
+        fd = os.open(file_path, os.O_RDONLY)
+        try:
+            # the mapping shares the open file, and with it the larger read-ahead window
+            if hasattr(os, "posix_fadvise"):
+                with suppress(OSError):
+                    os.posix_fadvise(fd, 0, length, os.POSIX_FADV_SEQUENTIAL)
+            mapping = mmap.mmap(fd, 0, access=mmap.ACCESS_READ)
+        finally:
+            os.close(fd)
+        # parts are read front to back, let the kernel read ahead aggressively
+        if hasattr(mapping, "madvise") and hasattr(mmap, "MADV_SEQUENTIAL"):
+            with suppress(OSError):
+                mapping.madvise(mmap.MADV_SEQUENTIAL)
+        return mapping
+
+    async def async_download(
+        self,
+        source: str,
+        destination: Optional[str] = None,
+        force: bool = False,
+        resume: bool = False,
+        max_parallel_parts: int = TRANSFER_MAX_PARALLEL_PARTS,
+    ) -> TransferHandler:
+        """
+        Coroutine version of :py:meth:`download`.
+        Waits for the transfer to end without blocking the event loop. Cancelling the coroutine
+        aborts the transfer.
+
+        Args:
+            source:                 The path to the file to download in the storage space.
+            destination:            The local path the file is downloaded to.
+            force:                  Whether the destination file is overwritten in case it exists.
+            resume:                 Whether to resume a previous (interrupted) download to the same
+                                    `destination` instead of starting over.
+            max_parallel_parts:     (Optional) Maximum number of parts (or segments) downloaded at
+                                    the same time.
+
+        Returns:
+            TransferHandler:    An handler to the (ended) transfer operation.
+
+        Raises:
+            ValueError:                 One of the arguments has an illegal value.
+            FileNotFoundError:          The object was not found in the storage space.
+            dt_data_api.TransferError:  An error occurs while transferring the data from the DCSS.
+
+        """
+        handler = await self._start_transfer(
+            partial(self.download, source, destination, force, resume, max_parallel_parts)
+        )
+        return await self._wait_transfer(handler)
+
+    async def async_upload(
+        self,
+        source: Union[str, bytes, bytearray, memoryview, BinaryIO],
+        destination: str,
+        length: int = None,
+        part_size: int = None,
+        max_parallel_parts: int = TRANSFER_MAX_PARALLEL_PARTS,
+    ) -> TransferHandler:
+        """
+        Coroutine version of :py:meth:`upload`.
+        Waits for the transfer to end without blocking the event loop. Cancelling the coroutine
+        aborts the transfer.
+
+        Args:
+            source:                 `str` - The local path of the file to upload.\n
+                                    `bytes` - Content of the file as `bytes`-like object.\n
+                                    `BinaryIO` - A file-like object.
+            destination:            The path to the resulting file in the storage space.
+            length:                 (Optional) Length of the data in bytes. Only needed when
+                                    `source` is of type `BinaryIO`.
+            part_size:              (Optional) Size in bytes of the parts the data is split into.
+            max_parallel_parts:     (Optional) Maximum number of parts uploaded at the same time.
+
+        Returns:
+            TransferHandler:    An handler to the (ended) transfer operation.
+
+        Raises:
+            ValueError:                 One of the arguments has an illegal value.
+            dt_data_api.TransferError:  An error occurs while transferring the data to the DCSS.
+
+        """
+        handler = await self._start_transfer(
+            partial(self.upload, source, destination, length, part_size, max_parallel_parts)
+        )
+        return await self._wait_transfer(handler)
+
+    @staticmethod
+    async def _start_transfer(start: Callable[[], TransferHandler]) -> TransferHandler:
+        """
+        Starts a transfer operation without blocking the event loop.
+
+        Args:
+            start:      A callable object starting the transfer and returning its handler.
+
+        Returns:
+            TransferHandler:    The handler to the (started) transfer operation.
+
+        Raises:
+            asyncio.CancelledError:     The start was cancelled, the transfer is aborted as soon as
+                                        it is started.
+        """
+        loop = asyncio.get_running_loop()
+        future = loop.run_in_executor(None, start)
+        try:
+            return await asyncio.shield(future)
+        except asyncio.CancelledError:
+            # the transfer starts anyway, stop it before it gets going
+            future.add_done_callback(lambda f: f.cancelled() or f.exception() or f.result().abort())
+            raise
+
+    @staticmethod
+    async def _wait_transfer(handler: TransferHandler) -> TransferHandler:
+        """
+        Waits for a transfer operation to end without blocking the event loop.
+
+        Args:
+            handler:    The handler to the transfer operation.
+
+        Returns:
+            TransferHandler:    The same handler, once the transfer ended.
+
+        Raises:
+            asyncio.CancelledError:     The waiting was cancelled, the transfer is aborted.
+        """
+        # the jobs complete futures of their own, waiting on them does not hold a thread
+        loop = asyncio.get_running_loop()
+        jobs = handler.futures
+        ended = loop.create_future()
+
+        def set_ended():
+            if not ended.done():
+                ended.set_result(None)
+
+        def on_job_done(_):
+            if all(job.done() for job in jobs):
+                # the loop may be closed by the time the jobs end (e.g., once the waiting is cancelled)
+                with suppress(RuntimeError):
+                    loop.call_soon_threadsafe(set_ended)
+
+        if not jobs:
+            return handler
+        for job in jobs:
+            job.add_done_callback(on_job_done)
+        try:
+            await ended
+        except asyncio.CancelledError:
+            handler.abort()
+            raise
+        return handler
+
     def _sanitize_remote_path(self, path: str) -> str:
         """
         Sanitizes a remote path for this storage space.
@@ -441,29 +927,264 @@ class Storage(object):
         """
         return path.lstrip("/")
 
-    def _get_parts(self, obj: str):
+    def _get_parts(self, obj: str) -> List[Item]:
         """
-        Returns a list of parts to download and append together to form the complete file.
+        Returns the list of parts to download and append together to form the complete file.
 
         Args:
             obj:    The path to the object in the storage space.
 
+        Returns:
+            list[Item]:     The parts of the object, in order.
+
+        Raises:
+            FileNotFoundError:          The object was not found in the storage space.
+            dt_data_api.TransferError:  The storage does not report the size of a part.
+
+        """
+        # a single listing finds the parts and their size in one round-trip
+        try:
+            items = self._list_parts(obj)
+        except (APIError, TransferError):
+            items = None
+        if items is not None:
+            return items
+        # fall back to probing the object with HEAD requests, the probe returns the metadata of
+        # the first part
+        parts, first = self._probe_parts(obj)
+        metas = [first] + [None] * (len(parts) - 1)
+
+        # get the metadata of the other parts, concurrently
+        def head(i: int):
+            metas[i] = self.head(parts[i])
+
+        calls = (partial(head, i) for i in range(1, len(parts)))
+        run_bounded(self._api.executor, calls, METADATA_MAX_PARALLEL_REQUESTS)
+        items = [Item.parse_headers(part, meta) for part, meta in zip(parts, metas)]
+        for item in items:
+            if item.size == UNKNOWN_SIZE:
+                raise TransferError(f"Transfer Error: The storage did not report the size of '{item.key}'.")
+        return items
+
+    def _peek_object(
+        self, obj: str, url_for: Callable[[str], str]
+    ) -> Optional[Tuple[Item, requests.Response]]:
+        """
+        Requests a single-part object, the response is left unread.
+
+        Args:
+            obj:        The path to the object in the storage space.
+            url_for:    A callable object returning the url to a given object.
+
+        Returns:
+            tuple[Item, requests.Response]:     The object and the response streaming its content,
+                                                or ``None`` if the object does not exist as a
+                                                single part (e.g., it is a multipart object).
+
+        Raises:
+            dt_data_api.TransferError:  An error occurs while transferring the data from the DCSS,
+                                        or the storage refuses the request (e.g., with 403).
+
+        """
+        try:
+            res = self._api.session.get(url_for(obj), stream=True)
+        except APIError:
+            return None
+        except requests.exceptions.RequestException as e:
+            raise TransferError(e)
+        # ---
+        if res.status_code != 200:
+            # consume the (short) error body, so that the connection goes back to the pool
+            with res:
+                _ = res.content
+            self._check_signed_url(res, "get_object", obj)
+            # only a missing object can still be a multipart one, anything else is an error
+            if res.status_code == 404:
+                return None
+            raise TransferError(f"Transfer Error: Code: {res.status_code} Message: {res.text}")
+        item = Item.parse_headers(obj, res.headers)
+        if item.size == UNKNOWN_SIZE:
+            # the size of the object is needed upfront, the listing (or a HEAD request) tells it
+            res.close()
+            return None
+        return item, res
+
+    def _list_parts(self, obj: str) -> Optional[List[Item]]:
+        """
+        Finds the parts of an object by listing the objects sharing its name as prefix.
+
+        Args:
+            obj:    The path to the object in the storage space.
+
+        Returns:
+            list[Item]:     The parts of the object, in order, or ``None`` if the listing is
+                            not conclusive.
+
+        Raises:
+            dt_data_api.TransferError:  An error occurs while transferring the data from the DCSS.
+            dt_data_api.APIError:       An error occurs while communicating with the DCSS.
+
+        """
+        items = {item.key: item for item in self.list_objects(obj, items=True)}
+        if obj in items or obj + ".000" not in items:
+            # the object is not (or not anymore) a multipart object
+            with self._parts_cache_lock:
+                self._parts_cache.pop(obj, None)
+            return [items[obj]] if obj in items else None
+        # the number of parts (and the encoding of the object) is only stored in the metadata of
+        # the first part, as long as the first part does not change, neither does the number of parts
+        etag = items[obj + ".000"].etag
+        with self._parts_cache_lock:
+            layout = self._parts_cache.get(obj)
+        if layout is None or layout[0] != etag:
+            res = self.head(obj + ".000")
+            parts = [obj + f".{p:03d}" for p in range(int(res.get("x-amz-meta-number-of-parts", "1")))]
+            layout = self._cache_parts(obj, parts, res)
+        _, parts, encoding = layout
+        if not all(part in items for part in parts):
+            return None
+        return [dataclasses.replace(items[part], content_encoding=encoding) for part in parts]
+
+    def _probe_parts(self, obj: str) -> Tuple[List[str], Dict[str, str]]:
+        """
+        Finds the parts of an object by probing its single-part and multipart names.
+
+        Args:
+            obj:    The path to the object in the storage space.
+
+        Returns:
+            tuple[list[str], dict]:     The keys of the parts of the object, in order, and the
+                                        metadata of the first one.
+
         Raises:
             FileNotFoundError:  The object was not found in the storage space.
 
         """
-        modes = [
-            (False, obj, lambda _: obj),
-            (True, obj + ".000", lambda p: obj + f".{p:03d}"),
+        # probe both names at once, a multipart object does not pay for the single-part probe first
+        single, multi = (self._api.executor.submit(self.head, name) for name in [obj, obj + ".000"])
+        with suppress(FileNotFoundError):
+            res = single.result()
+            with self._parts_cache_lock:
+                self._parts_cache.pop(obj, None)
+            return [obj], res
+        try:
+            res = multi.result()
+        except FileNotFoundError:
+            raise FileNotFoundError(f"Object '{obj}' not found")
+        parts = int(res.get("x-amz-meta-number-of-parts", "1"))
+        parts = [obj + f".{p:03d}" for p in range(parts)]
+        self._cache_parts(obj, parts, res)
+        return parts, res
+
+    def _cache_parts(self, obj: str, parts: List[str], first: Dict[str, str]) -> Tuple[str, List[str], str]:
+        """
+        Stores the layout of a multipart object, as long as its first part does not change.
+
+        Args:
+            obj:        The path to the object in the storage space.
+            parts:      The keys of the parts of the object, in order.
+            first:      The metadata of the first part.
+
+        Returns:
+            tuple[str, list[str], str]:     The ETag of the first part, the keys of the parts and
+                                            the encoding of the object.
+        """
+        layout = first.get("ETag", "").strip('"'), parts, first.get("Content-Encoding", "identity")
+        with self._parts_cache_lock:
+            self._parts_cache[obj] = layout
+            self._parts_cache.move_to_end(obj)
+            while len(self._parts_cache) > PARTS_CACHE_SIZE:
+                self._parts_cache.popitem(last=False)
+        return layout
+
+    @staticmethod
+    def _split_parts(lengths: List[int]) -> List[Tuple[int, int, int]]:
+        """
+        Splits the parts of an object into segments that can be downloaded independently.
+
+        Args:
+            lengths:    The size of each part of the object.
+
+        Returns:
+            list[tuple[int, int, int]]:     The index of the part, the position within the part and
+                                            the length of each segment, in order.
+        """
+        return [
+            (i, start, min(DOWNLOAD_SEGMENT_SIZE_B, length - start))
+            for i, length in enumerate(lengths)
+            for start in range(0, max(length, 1), DOWNLOAD_SEGMENT_SIZE_B)
         ]
-        for multipart, source, part_name in modes:
-            try:
-                res = self.head(source)
-                parts = int(res.get("x-amz-meta-number-of-parts", "1"))
-                return [obj] if not multipart else [part_name(p) for p in range(parts)]
-            except FileNotFoundError:
-                pass
-        raise FileNotFoundError(f"Object '{obj}' not found")
+
+    @staticmethod
+    def _load_download_journal(
+        path: str, items: List[Item], segments: List[Tuple[int, int, int]]
+    ) -> Optional[List[int]]:
+        """
+        Loads the journal of an interrupted download.
+
+        Args:
+            path:       The path to the journal file.
+            items:      The parts of the object being downloaded.
+            segments:   The segments the parts are split into.
+
+        Returns:
+            list[int]:  Number of bytes of each segment already downloaded, or ``None`` if there is
+                        no valid journal for these segments (e.g., the object changed in the
+                        meantime).
+        """
+        try:
+            with open(path, "rt") as fin:
+                journal = json.load(fin)
+            parts = journal["parts"]
+            expected = [{"key": item.key, "etag": item.etag, "size": item.size} for item in items]
+            if [{k: part.get(k) for k in ["key", "etag", "size"]} for part in parts] != expected:
+                return None
+            recorded = {
+                (i, start, length): d for i, part in enumerate(parts) for start, length, d in part["segments"]
+            }
+            return [max(0, min(int(recorded[segment]), segment[2])) for segment in segments]
+        except (OSError, ValueError, KeyError, TypeError):
+            return None
+
+    @staticmethod
+    def _save_download_journal(
+        path: str, items: List[Item], segments: List[Tuple[int, int, int]], done: List[int]
+    ):
+        """
+        Saves the journal of a download, so that it can be resumed if interrupted.
+
+        Args:
+            path:       The path to the journal file.
+            items:      The parts of the object being downloaded.
+            segments:   The segments the parts are split into.
+            done:       Number of bytes of each segment already downloaded.
+        """
+        journal = {
+            "parts": [
+                {"key": item.key, "etag": item.etag, "size": item.size, "segments": []} for item in items
+            ]
+        }
+        for (i, start, length), d in zip(segments, done):
+            journal["parts"][i]["segments"].append([start, length, d])
+        with open(f"{path}.tmp", "wt") as fout:
+            json.dump(journal, fout)
+        os.replace(f"{path}.tmp", path)
+
+    def _check_signed_url(
+        self, res: requests.Response, action: str, obj: str, headers: Dict[str, str] = None
+    ):
+        """
+        Forgets the signed URL a request was sent to when the storage rejects it, so that the next
+        request for the same object is authorized anew instead of reusing it until it expires.
+
+        Args:
+            res:        The response from the storage.
+            action:     Action the URL was signed for.
+            obj:        Path to the object the URL was signed for.
+            headers:    (Optional) Extra headers the URL was signed with.
+        """
+        if res.status_code == 403 and self._name != "public":
+            self._api.invalidate(action, self._full_name, obj, headers)
 
     def _check_token(self, resource: str = None):
         """
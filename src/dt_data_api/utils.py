@@ -1,16 +1,55 @@
 import io
+import os
+import sys
+import ctypes
 import math
+import http.client
+import queue
+import stat
 import time
 from enum import Enum
-from threading import Thread
-from typing import Union, Iterator, BinaryIO, Optional, Callable
-from functools import partial
-
-from .constants import MAXIMUM_ALLOWED_SIZE, TRANSFER_BUF_SIZE_B
-from .exceptions import TransferAborted
+from threading import Event, Lock
+from typing import Union, Iterator, Iterable, List, Optional, Callable, Tuple, Any, Dict
+from concurrent.futures import Executor, Future, ThreadPoolExecutor, FIRST_COMPLETED, wait
+from collections import deque
+from contextlib import suppress, contextmanager
+
+import urllib3
+
+from .constants import (
+    MAXIMUM_ALLOWED_SIZE,
+    TRANSFER_BUF_SIZE_B,
+    TRANSFER_MIN_BUF_SIZE_B,
+    TRANSFER_BUF_GROWTH_THRESHOLD_BPS,
+    TRANSFER_THROUGHPUT_WINDOW_S,
+    PROGRESS_FIRE_INTERVAL_S,
+    TRANSFER_JOBS_MAX_WORKERS,
+    PROGRESS_SPEED_WINDOW_S,
+)
+from .exceptions import TransferAborted, TransferError
+from .logging import logger
 
 
 class BytesBuffer(io.BytesIO):
+    def __init__(self, *args, **kwargs):
+        super(BytesBuffer, self).__init__(*args, **kwargs)
+        self._lock = Lock()
+
+    def pwrite(self, data: bytes, offset: int) -> int:
+        """
+        Writes a chunk of bytes at a given position of the buffer. Safe to call from multiple threads.
+
+        Args:
+            data:   Chunk of bytes to write.
+            offset: Position in the buffer of the first byte to write.
+
+        Returns:
+            int:    Number of bytes written.
+        """
+        with self._lock:
+            self.seek(offset)
+            return self.write(data)
+
     def fp(self):
         return self
 
@@ -21,34 +60,463 @@ class BytesBuffer(io.BytesIO):
         pass
 
 
-class WorkerThread(Thread):
+def pwrite(fd: int, data: bytes, offset: int):
+    """
+    Writes a chunk of bytes at a given position of a file without moving the file's cursor.
+    Safe to call from multiple threads on the same file descriptor.
+
+    Args:
+        fd:     File descriptor of the file to write to.
+        data:   Chunk of bytes to write.
+        offset: Position in the file of the first byte to write.
+    """
+    view = memoryview(data)
+    while len(view):
+        written = os.pwrite(fd, view, offset)
+        view = view[written:]
+        offset += written
+
+
+# Linux fallocate(2) flag, allocate the blocks without changing the size of the file
+_FALLOC_FL_KEEP_SIZE = 0x01
+# libc's fallocate(2), loaded on first use, False where not available
+_fallocate = None
+
+
+def _get_fallocate() -> Optional[Callable[[int, int, int, int], int]]:
+    global _fallocate
+    if _fallocate is None:
+        _fallocate = False
+        if sys.platform.startswith("linux"):
+            with suppress(OSError, AttributeError):
+                libc = ctypes.CDLL(None, use_errno=True)
+                # the 64-bit variant takes 64-bit offsets on 32-bit systems as well
+                func = getattr(libc, "fallocate64", None) or libc.fallocate
+                func.argtypes = [ctypes.c_int, ctypes.c_int, ctypes.c_int64, ctypes.c_int64]
+                func.restype = ctypes.c_int
+                _fallocate = func
+    return _fallocate or None
+
+
+def preallocate(fd: int, length: int):
+    """
+    Sets the size of a file and, where the filesystem supports it natively (Linux only), reserves
+    its blocks on disk upfront so that the filesystem can lay the file out in contiguous extents.
+
+    `os.posix_fallocate` is not used on purpose, on filesystems without native support (e.g., NFS,
+    ext3) glibc emulates it by writing every block of the file, which stalls large downloads
+    before they even start. The fallocate(2) system call fails instead, the file is then only
+    sized (sparse), which is all the download needs.
+
+    Args:
+        fd:     File descriptor of the file to allocate.
+        length: Final size of the file in bytes.
+    """
+    os.ftruncate(fd, length)
+    fallocate = _get_fallocate() if length > 0 else None
+    if fallocate is not None:
+        # not every filesystem supports it, the file is already sized either way
+        fallocate(fd, _FALLOC_FL_KEEP_SIZE, 0, length)
+
+
+def drop_cache(fd: int, offset: int = 0, length: int = 0):
+    """
+    Hints the kernel that a region of a file is not going to be accessed again soon, so that its
+    pages can be reclaimed from the page cache instead of the (warm) pages of other files.
+    Pages not written to disk yet are only scheduled for writing, they are reclaimed afterwards.
+    Does nothing where not supported.
+
+    Args:
+        fd:     File descriptor of the file.
+        offset: Position in the file of the first byte of the region.
+        length: Length of the region in bytes, 0 means up to the end of the file.
+    """
+    if hasattr(os, "posix_fadvise"):
+        with suppress(OSError):
+            os.posix_fadvise(fd, offset, length, os.POSIX_FADV_DONTNEED)
+
+
+class ChunkSizer:
+    """
+    Picks the size of the chunks read from a connection based on the measured throughput.
+    Chunks start small, so that slow links still report progress and react to aborts quickly,
+    and double in size, up to `maximum`, as long as the throughput stays above `threshold`.
+
+    Args:
+        size:       Initial chunk size in number of `bytes`.
+        maximum:    Maximum chunk size in number of `bytes`.
+        threshold:  Throughput in `bytes/s` above which the chunk size grows.
+        window:     Time window in seconds the throughput is averaged over.
+    """
+
+    def __init__(
+        self,
+        size: int = TRANSFER_MIN_BUF_SIZE_B,
+        maximum: int = TRANSFER_BUF_SIZE_B,
+        threshold: float = TRANSFER_BUF_GROWTH_THRESHOLD_BPS,
+        window: float = TRANSFER_THROUGHPUT_WINDOW_S,
+    ):
+        self._maximum = maximum
+        self._size = min(size, maximum)
+        self._threshold = threshold
+        self._window = window
+        self._throughput = None
+
+    @property
+    def size(self) -> int:
+        """
+        Current chunk size in number of `bytes`.
+        """
+        return self._size
+
+    @property
+    def maximum(self) -> int:
+        """
+        Maximum chunk size in number of `bytes`.
+        """
+        return self._maximum
+
+    @property
+    def throughput(self) -> Optional[float]:
+        """
+        Exponential moving average of the throughput in `bytes/s`, if measured.
+        """
+        return self._throughput
+
+    def update(self, nbytes: int, elapsed: float):
+        """
+        Records a new sample and grows the chunk size if the link is fast enough.
+
+        Args:
+            nbytes:     Number of bytes transferred.
+            elapsed:    Time in seconds it took to transfer them.
+        """
+        if elapsed <= 0:
+            return
+        sample = nbytes / elapsed
+        if self._throughput is None:
+            self._throughput = sample
+        else:
+            # samples are weighted by their duration, older ones fade out over `window` seconds
+            alpha = 1 - math.exp(-elapsed / self._window)
+            self._throughput += alpha * (sample - self._throughput)
+        # ---
+        if self._throughput > self._threshold and self._size < self._maximum:
+            self._size = min(2 * self._size, self._maximum)
+
+
+class BufferPool:
     """
-    Worker thread performing a generic `job`.
+    Free list of reusable buffers of the same size.
+    Buffers are handed out by :py:meth:`acquire` and given back by :py:meth:`release`, so that
+    long transfers do not allocate (and page in) a new buffer for each part.
+    A new buffer is allocated when none is idle, only up to `count` idle buffers are kept.
 
     Args:
-        job:    A callable object expecting this `WorkerThread` object as first and sole argument.
-        args:   Other positional arguments for the underlying :py:class:`threading.Thread` object.
-        kwargs: Other named arguments for the underlying :py:class:`threading.Thread` object.
+        size:       Size of each buffer in number of `bytes`.
+        count:      Maximum number of idle buffers kept for reuse.
     """
 
-    def __init__(self, job: Callable, *args, **kwargs):
-        super(WorkerThread, self).__init__(*args, **kwargs)
+    def __init__(self, size: int, count: int):
+        self._size = size
+        self._idle = queue.LifoQueue(maxsize=count)
+
+    @property
+    def size(self) -> int:
+        """
+        Size of each buffer in number of `bytes`.
+        """
+        return self._size
+
+    def acquire(self) -> bytearray:
+        """
+        Returns an idle buffer, or a new one if none is available.
+        """
+        try:
+            return self._idle.get_nowait()
+        except queue.Empty:
+            return bytearray(self._size)
+
+    def release(self, buffer: bytearray):
+        """
+        Gives a buffer back to the pool, it must not be used by the caller afterwards.
+
+        Args:
+            buffer:     A buffer returned by :py:meth:`acquire`.
+        """
+        if len(buffer) != self._size:
+            return
+        with suppress(queue.Full):
+            self._idle.put_nowait(buffer)
+
+
+def iter_response(
+    response,
+    bufsize: int = TRANSFER_BUF_SIZE_B,
+    sizer: Optional[ChunkSizer] = None,
+    coalesce: int = 0,
+    pool: Optional[BufferPool] = None,
+) -> Iterator[Union[bytes, memoryview]]:
+    """
+    Iterator of chunks of bytes from the body of a streamed HTTP response.
+
+    When the body is not encoded, data is read from the connection straight into a single
+    reusable buffer instead of allocating a new `bytes` object per chunk, and the connection
+    is given back to the pool once the body is fully read.
+    Each chunk is only valid until the next one is requested.
+
+    Args:
+        response:   A :py:class:`requests.Response` object created with ``stream=True``.
+        bufsize:    Buffer size in number of `bytes`. Each read will have at most this size.
+                    Ignored when `sizer` is given.
+        sizer:      (Optional) A :py:class:`ChunkSizer` object picking the size of each read
+                    from the measured throughput.
+        coalesce:   (Optional) Consecutive reads are merged into chunks of at least this size
+                    (except for the last one), without copying, to save work downstream
+                    (e.g., write calls).
+        pool:       (Optional) A :py:class:`BufferPool` object the buffer is taken from (and given
+                    back to), if its buffers are large enough.
+    """
+    fp = getattr(response.raw, "_fp", None)
+    if response.headers.get("Content-Encoding", "identity") != "identity" or not hasattr(fp, "readinto"):
+        # decode straight from urllib3, without going through the iterator of `requests`
+        try:
+            yield from response.raw.stream(sizer.size if sizer else bufsize, decode_content=True)
+        except (urllib3.exceptions.HTTPError, http.client.HTTPException) as e:
+            raise TransferError(f"Transfer Error: {e}") from e
+        return
+    # ---
+    length = max(sizer.maximum if sizer else bufsize, coalesce)
+    pooled = pool is not None and pool.size >= length
+    buffer = pool.acquire() if pooled else bytearray(length)
+    view = memoryview(buffer)[:length]
+    filled = 0
+    try:
+        while True:
+            size = min(sizer.size if sizer else bufsize, len(view) - filled)
+            # reads are only timed while the chunk size can still grow
+            timed = sizer is not None and sizer.size < sizer.maximum
+            start = time.monotonic() if timed else None
+            try:
+                n = fp.readinto(view[filled : filled + size])
+            except http.client.HTTPException as e:
+                # e.g., a chunked body cut short
+                raise TransferError(f"Transfer Error: {e}") from e
+            if n and timed:
+                sizer.update(n, time.monotonic() - start)
+            filled += n or 0
+            # hand out what was read once enough of it was merged, the buffer is full or the body ended
+            if filled and (not n or filled >= coalesce or filled == len(view)):
+                yield view[:filled]
+                filled = 0
+            if not n:
+                break
+    finally:
+        # the last chunk was consumed once the caller asks for the next one (or stops asking)
+        if pooled:
+            pool.release(buffer)
+    # the connection may drop before the end of the body, `http.client` then reads nothing more
+    # without raising, the bytes it still expected tell the two apart
+    if getattr(fp, "length", None):
+        raise TransferError(f"Transfer Error: The connection closed with {fp.length} bytes left to read.")
+    # the body was read past the urllib3 response, release the connection explicitly
+    response.raw.release_conn()
+
+
+def run_bounded(
+    executor: Executor,
+    calls: Iterable[Callable[[], Any]],
+    window: int,
+    on_error: Optional[Callable[[BaseException], Any]] = None,
+):
+    """
+    Runs calls on a (possibly shared) executor, keeping at most `window` of them in flight.
+    Returns only once every call submitted has returned, so that the resources they use can be
+    released safely afterwards.
+    Calls must not wait on other calls submitted to the same executor.
+
+    Args:
+        executor:   Executor to run the calls on.
+        calls:      Callable objects expecting no arguments.
+        window:     Maximum number of calls in flight at any time.
+        on_error:   (Optional) A callable object called with the first exception raised by a call,
+                    as soon as it is raised. No more calls are submitted after that.
+
+    Raises:
+        BaseException:  The first exception raised by a call.
+    """
+    calls = iter(calls)
+    pending = set()
+    error = None
+    while True:
+        # keep the window full
+        while error is None and len(pending) < max(1, window):
+            call = next(calls, None)
+            if call is None:
+                break
+            try:
+                pending.add(executor.submit(call))
+            except RuntimeError as e:
+                # the executor was shut down, the calls in flight still need to be waited for
+                error = e
+                if on_error is not None:
+                    on_error(error)
+        if not pending:
+            break
+        # wait for the next call to return
+        done, pending = wait(pending, return_when=FIRST_COMPLETED)
+        for future in done:
+            if error is None and future.exception() is not None:
+                error = future.exception()
+                if on_error is not None:
+                    on_error(error)
+    # ---
+    if error is not None:
+        raise error
+
+
+class Prefetcher:
+    """
+    Computes the result of a function for given arguments ahead of time, on a (possibly shared)
+    executor (e.g., signs the URL to a part while the previous parts are still transferring).
+
+    Args:
+        executor:   Executor to run the calls on.
+        function:   A callable object expecting a single (hashable) argument.
+    """
+
+    def __init__(self, executor: Executor, function: Callable[[Any], Any]):
+        self._executor = executor
+        self._function = function
+        self._futures: Dict[Any, Future] = {}
+        self._lock = Lock()
+
+    def prefetch(self, arg: Any):
+        """
+        Starts computing the result for the given argument, unless it is already being computed.
+
+        Args:
+            arg:    The argument to call the function with.
+        """
+        with self._lock:
+            if arg not in self._futures:
+                self._futures[arg] = self._executor.submit(self._function, arg)
+
+    def get(self, arg: Any) -> Any:
+        """
+        Returns the result for the given argument, prefetched if possible, computed right away
+        otherwise.
+
+        Args:
+            arg:    The argument to call the function with.
+
+        Raises:
+            BaseException:  The exception raised by the function.
+        """
+        with self._lock:
+            future = self._futures.pop(arg, None)
+        # a call that did not start yet is not waited for, it could be queued behind the caller
+        if future is None or future.cancel():
+            return self._function(arg)
+        return future.result()
+
+
+# threads running the transfer jobs, shared by all the transfers of the process and created on first use
+_transfer_pool: Optional[ThreadPoolExecutor] = None
+_transfer_pool_lock = Lock()
+
+
+def _get_transfer_pool() -> ThreadPoolExecutor:
+    global _transfer_pool
+    with _transfer_pool_lock:
+        if _transfer_pool is None:
+            _transfer_pool = ThreadPoolExecutor(
+                max_workers=TRANSFER_JOBS_MAX_WORKERS, thread_name_prefix="dt-transfer"
+            )
+        return _transfer_pool
+
+
+def _reset_transfer_pool():
+    # the threads of the parent do not exist in a forked child, a pool inheriting them would
+    # queue jobs that never run
+    global _transfer_pool, _transfer_pool_lock
+    _transfer_pool = None
+    _transfer_pool_lock = Lock()
+
+
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_reset_transfer_pool)
+
+
+class WorkerThread:
+    """
+    Worker performing a generic `job` on a thread of a pool shared by all the transfers.
+
+    Args:
+        job:    A callable object expecting this `WorkerThread` object as its `worker` argument.
+    """
+
+    def __init__(self, job: Callable):
         self._job = job
-        self._is_shutdown = False
-        setattr(self, "run", partial(self._job, worker=self))
+        self._shutdown = Event()
+        self._future: Optional[Future] = None
 
     @property
     def is_shutdown(self) -> bool:
         """
         Whether the worker is interrupted.
         """
-        return self._is_shutdown
+        return self._shutdown.is_set()
+
+    def start(self):
+        """
+        Schedules the job on the shared pool.
+        """
+        if self._future is not None:
+            raise RuntimeError("Workers can only be started once.")
+        self._future = _get_transfer_pool().submit(self._job, worker=self)
+        self._future.add_done_callback(self._report)
+
+    @property
+    def future(self) -> Optional[Future]:
+        """
+        The future of the job, once started.
+        """
+        return self._future
+
+    def is_alive(self) -> bool:
+        """
+        Whether the job was started and is not done yet.
+        """
+        return self._future is not None and not self._future.done()
+
+    def join(self, timeout: Optional[float] = None):
+        """
+        Blocks until the job is done.
+
+        Args:
+            timeout:    (Optional) Maximum time to wait in seconds.
+        """
+        if self._future is None:
+            raise RuntimeError("Cannot join a worker before it is started.")
+        wait([self._future], timeout=timeout)
 
     def shutdown(self):
         """
         Interrupts the worker.
         """
-        self._is_shutdown = True
+        self._shutdown.set()
+
+    @staticmethod
+    def _report(future: Future):
+        """
+        Logs the errors the job did not handle, as a thread would print them.
+        """
+        if not future.cancelled() and future.exception() is not None:
+            error = future.exception()
+            logger.error(
+                "Unhandled error in transfer job", exc_info=(type(error), error, error.__traceback__)
+            )
 
 
 class TransferStatus(Enum):
@@ -91,17 +559,26 @@ class TransferProgress:
         transferred:    Number of bytes transferred so far.
         part:           Number of the part being transferred.
         parts:          Total number of parts to transfer.
+        part_size:      (Optional) Size in bytes of each part, when known.
     """
 
-    def __init__(self, total: int, transferred: int = 0, part: int = 1, parts: int = 1):
+    def __init__(
+        self, total: int, transferred: int = 0, part: int = 1, parts: int = 1, part_size: int = None
+    ):
         self._total = total
         self._transferred = transferred
         self._part = part
         self._parts = parts
+        self._part_size = part_size
         self._speed = 0
-        self._percentage = 0
-        self._last_update_time = None
-        self._callbacks = set()
+        self._percentage = math.floor(100 * transferred / total) if total else 0
+        # (time, transferred) samples within the last PROGRESS_SPEED_WINDOW_S seconds
+        self._samples = deque()
+        self._callbacks = []
+        self._lock = Lock()
+        # callbacks are fired at most once every `_fire_interval` seconds
+        self._fire_interval = PROGRESS_FIRE_INTERVAL_S
+        self._last_fire_time = None
 
     @property
     def total(self) -> int:
@@ -145,6 +622,13 @@ class TransferProgress:
         """
         return self._parts
 
+    @property
+    def part_size(self) -> Optional[int]:
+        """
+        Size in bytes of each part (the last one can be smaller), when known.
+        """
+        return self._part_size
+
     def register_callback(self, callback: Callable):
         """
         Registers a callback function that will be called every time an update to the progress
@@ -154,7 +638,8 @@ class TransferProgress:
             callback:   A callable object expecting this `TransferProgress` object as first and
                         sole argument.
         """
-        self._callbacks.add(callback)
+        if callback not in self._callbacks:
+            self._callbacks.append(callback)
 
     def unregister_callback(self, callback: Callable):
         """
@@ -166,39 +651,75 @@ class TransferProgress:
         if callback in self._callbacks:
             self._callbacks.remove(callback)
 
-    def update(self, total: int = None, transferred: int = None, part: int = None, parts: int = None):
+    def set_fire_interval(self, interval: float):
         """
-        Updates the internal state of the object.
+        Sets the minimum time between two consecutive calls to the registered callbacks.
+        Updates in between are merged, the update completing the transfer is always fired.
 
         Args:
-            total:          (Optional) Total number of bytes to transfer.
-            transferred:    (Optional) Number of bytes transferred so far.
-            part:           (Optional) Number of the part being transferred.
-            parts:          (Optional) Total number of parts to transfer.
+            interval:   Time in seconds, use `0` to fire on every update.
         """
-        if total is not None:
-            self._total = total
-        # ---
-        if transferred is not None:
-            new_data_len = transferred - self._transferred
-            # compute speed
-            if new_data_len > 0:
-                now = time.time()
-                if self._last_update_time is not None:
-                    self._speed = new_data_len / (now - self._last_update_time)
-                self._last_update_time = now
-            # compute percentage
-            self._percentage = math.floor(100 * transferred / self._total) if self._total else 0
-            # update transferred
-            self._transferred = transferred
-        # ---
-        if part is not None:
-            self._part = part
-        # ---
-        if parts is not None:
-            self._parts = parts
+        self._fire_interval = max(0.0, interval)
+
+    def update(
+        self,
+        total: int = None,
+        transferred: int = None,
+        part: int = None,
+        parts: int = None,
+        delta_transferred: int = 0,
+    ):
+        """
+        Updates the internal state of the object. Safe to call from multiple threads.
+
+        Args:
+            total:              (Optional) Total number of bytes to transfer.
+            transferred:        (Optional) Number of bytes transferred so far.
+            part:               (Optional) Number of the part being transferred.
+            parts:              (Optional) Total number of parts to transfer.
+            delta_transferred:  (Optional) Number of bytes transferred since the last update.
+                                Use this instead of `transferred` when multiple workers
+                                contribute to the same transfer.
+        """
+        with self._lock:
+            now = time.monotonic()
+            if total is not None:
+                self._total = total
+            # ---
+            if transferred is None and delta_transferred:
+                transferred = self._transferred + delta_transferred
+            if transferred is not None:
+                # compute speed over a time window, updates from concurrent parts can be
+                # arbitrarily close in time
+                if transferred > self._transferred:
+                    self._samples.append((now, transferred))
+                    while self._samples[0][0] < now - PROGRESS_SPEED_WINDOW_S:
+                        self._samples.popleft()
+                    if len(self._samples) > 1:
+                        (t0, transferred0), (t1, transferred1) = self._samples[0], self._samples[-1]
+                        if t1 > t0:
+                            self._speed = (transferred1 - transferred0) / (t1 - t0)
+                # compute percentage
+                self._percentage = math.floor(100 * transferred / self._total) if self._total else 0
+                # update transferred
+                self._transferred = transferred
+            # ---
+            if part is not None:
+                self._part = part
+            # ---
+            if parts is not None:
+                self._parts = parts
+            # ---
+            fire = (
+                self._last_fire_time is None
+                or now - self._last_fire_time >= self._fire_interval
+                or (transferred is not None and self._transferred >= self._total)
+            )
+            if fire:
+                self._last_fire_time = now
         # fire a new update event
-        self._fire()
+        if fire:
+            self._fire()
 
     def _fire(self):
         """
@@ -236,8 +757,8 @@ class TransferHandler:
         self._buffer: Optional[io.BytesIO] = None
         self._status = TransferStatus.UNKNOWN
         self._reason = "(none)"
-        self._workers = set()
-        self._callbacks = set()
+        self._workers = []
+        self._callbacks = []
         # register the transfer handler as a progress callback
         self._progress.register_callback(self._fire)
 
@@ -318,6 +839,13 @@ class TransferHandler:
         self.status = new_status
         self._reason = reason
 
+    @property
+    def futures(self) -> List[Future]:
+        """
+        The futures of the jobs of this transfer operation, all done once it is completed.
+        """
+        return [worker.future for worker in self._workers if worker.future is not None]
+
     def add_worker(self, worker: WorkerThread):
         """
         Adds a worker to this tranfer operation.
@@ -325,7 +853,8 @@ class TransferHandler:
         Args:
             worker: A worker thread object performing a job relative to this transfer operation.
         """
-        self._workers.add(worker)
+        if worker not in self._workers:
+            self._workers.append(worker)
 
     def register_callback(self, callback: Callable):
         """
@@ -335,7 +864,8 @@ class TransferHandler:
             callback:   A callable object expecting this `TransferHandler` object as first and
                         sole argument.
         """
-        self._callbacks.add(callback)
+        if callback not in self._callbacks:
+            self._callbacks.append(callback)
 
     def unregister_callback(self, callback: Callable):
         """
@@ -387,27 +917,14 @@ class TransferHandler:
         return str(self._progress)
 
 
-class IterableIO:
+def _seekable(stream: io.IOBase) -> bool:
     """
-    A converter object turning a file-like object into an iterator of chunks of bytes.
-
-    Args:
-        stream:     Underlying stream to consume.
-        bufsize:    Buffer size in number of `bytes`. Each chunk will have at most this size.
+    Whether a stream can be positioned at arbitrary offsets.
     """
-
-    def __init__(self, stream: Union[io.RawIOBase, BinaryIO], bufsize: int = TRANSFER_BUF_SIZE_B):
-        self._stream = stream
-        self._bufsize = bufsize
-
-    def __iter__(self) -> Iterator[bytes]:
-        """
-        Iterator of chunks of bytes.
-        """
-        buf = self._stream.read(self._bufsize)
-        while len(buf):
-            yield buf
-            buf = self._stream.read(self._bufsize)
+    try:
+        return bool(stream.seekable())
+    except (AttributeError, OSError, ValueError):
+        return False
 
 
 class RangedStream(io.RawIOBase):
@@ -419,14 +936,31 @@ class RangedStream(io.RawIOBase):
         stream: Underlying file-like object to consume.
         seek:   Position of the first byte to consume from `stream`.
         limit:  Total number of bytes to consume from `stream`.
+        lock:   (Optional) Lock shared by all the `RangedStream` objects reading from `stream`
+                concurrently. When given, every read seeks to its own position first. Streams that
+                cannot seek (e.g., pipes) are never positioned, their regions must be consumed in
+                order, one after the other.
+        fd:     (Optional) File descriptor of the regular file underlying `stream`. When given,
+                reads go straight to the file at their own position, without locking.
     """
 
-    def __init__(self, stream: io.RawIOBase, seek: int, limit: int):
+    def __init__(
+        self,
+        stream: io.RawIOBase,
+        seek: int,
+        limit: int,
+        lock: Optional[Lock] = None,
+        fd: Optional[int] = None,
+    ):
         self._stream = stream
-        self._seek = seek
-        self._transferred = 0
-        self._limit = limit
-        self._initialized = False
+        # absolute position of the next byte to consume and of the end of the region
+        self._pos = seek
+        self._end = seek + limit
+        self._lock = lock
+        self._fd = fd
+        self._seekable = _seekable(stream)
+        # without a lock, the stream is only ours and needs to be positioned once
+        self._initialized = lock is not None or fd is not None or not self._seekable
 
     def close(self):
         """
@@ -434,128 +968,290 @@ class RangedStream(io.RawIOBase):
         """
         return
 
-    def read(self, size: int = ...) -> Optional[bytes]:
+    def readable(self) -> bool:
+        return True
+
+    def read(self, size: int = -1) -> bytes:
         """
         Reads a chunk of bytes of size at most `size`.
 
         Args:
-            size:   Maximum size of bytes to read at once.
+            size:   Maximum size of bytes to read at once, `-1` reads everything left.
 
         Returns:
             bytes:  Chunk of bytes.
         """
-        if not self._initialized:
-            self._stream.seek(self._seek)
-            self._initialized = True
-        size = min(size, self._limit - self._transferred)
-        chunk = self._stream.read(size)
-        self._transferred += len(chunk)
+        size = self._end - self._pos if size is None or size < 0 else min(size, self._end - self._pos)
+        if size <= 0:
+            return b""
+        if self._fd is not None:
+            chunk = os.pread(self._fd, size, self._pos)
+        else:
+            with self._locked():
+                chunk = self._stream.read(size)
+        self._pos += len(chunk)
         return chunk
 
+    def readinto(self, buffer) -> int:
+        """
+        Reads bytes into a pre-allocated, writable bytes-like object.
+
+        Args:
+            buffer: Buffer to fill, at most `len(buffer)` bytes are read.
+
+        Returns:
+            int:    Number of bytes read, `0` at the end of the region.
+        """
+        view = memoryview(buffer).cast("B")
+        view = view[: max(0, self._end - self._pos)]
+        if not view:
+            return 0
+        n = None
+        if self._fd is not None and hasattr(os, "preadv"):
+            n = os.preadv(self._fd, [view], self._pos)
+        elif self._fd is None and hasattr(self._stream, "readinto"):
+            # streams implementing `read` only inherit a `readinto` that is not implemented
+            with suppress(NotImplementedError), self._locked():
+                n = self._stream.readinto(view) or 0
+        if n is None:
+            chunk = self.read(len(view))
+            view[: len(chunk)] = chunk
+            return len(chunk)
+        self._pos += n
+        return n
+
+    @contextmanager
+    def _locked(self):
+        """
+        Positions the underlying stream at the next byte of the region, holding the shared lock
+        (if any) for as long as the context lasts.
+        """
+        if self._lock is None:
+            if not self._initialized:
+                self._stream.seek(self._pos)
+                self._initialized = True
+            yield
+            return
+        with self._lock:
+            if self._seekable:
+                self._stream.seek(self._pos)
+            yield
+
 
 class MultipartBytesIO:
     """
     Splitter of large stream of bytes.
+    The parts share the underlying stream and can be consumed concurrently.
 
     Args:
-        stream:     Underlying file-like object.
+        stream:     Underlying file-like object, or a `memoryview` of the data (e.g., of a
+                    memory-mapped file), in which case parts are slices of it.
         length:     Length of the stream.
         part_size:  Size of each block in the partition.
     """
 
-    def __init__(self, stream: io.RawIOBase, length: int, part_size: int = MAXIMUM_ALLOWED_SIZE):
+    def __init__(
+        self, stream: Union[io.RawIOBase, memoryview], length: int, part_size: int = MAXIMUM_ALLOWED_SIZE
+    ):
         self._stream = stream
         self._stream_length = length
         self._part_size = part_size
         self._start = 0
+        self._lock = Lock()
+        self._fd = None
+        # slices of the data handed out so far, released by `close`
+        self._views = []
+        self._sequential = False
+        if not isinstance(stream, memoryview):
+            self._fd = self._regular_file_fileno(stream)
+            # streams that cannot seek (e.g., pipes) are read front to back, one part after the other
+            self._sequential = self._fd is None and not _seekable(stream)
 
-    def __iter__(self) -> Iterator[RangedStream]:
+    def __iter__(self) -> Iterator[Tuple[int, Union[RangedStream, memoryview]]]:
         """
-        Iterator of `RangedStream` object.
+        Iterator of (length, `RangedStream` or `memoryview`) pairs, one per part.
         """
         for i in range(self.number_of_parts()):
             cursor = i * self._part_size
             part_length = min(self._stream_length - cursor, self._part_size)
-            yield part_length, RangedStream(self._stream, cursor, self._part_size)
+            if isinstance(self._stream, memoryview):
+                view = self._stream[cursor : cursor + part_length]
+                self._views.append(view)
+                yield part_length, view
+            else:
+                stream = RangedStream(self._stream, cursor, self._part_size, self._lock, self._fd)
+                yield part_length, stream
+
+    @property
+    def sequential(self) -> bool:
+        """
+        Whether the parts must be consumed in order, one after the other.
+        """
+        return self._sequential
+
+    def close(self):
+        """
+        Releases the slices of the data handed out as parts, even those still referenced (e.g.,
+        by a traceback), so that the memory they view (e.g., a memory-mapped file) can be freed.
+        The parts must not be used afterwards.
+        """
+        for view in self._views:
+            view.release()
+        self._views.clear()
 
     def number_of_parts(self) -> int:
         """
         Number of parts (partition blocks).
 
         Returns:
-            int:    Number of parts produced by this splitter.
+            int:    Number of parts produced by this splitter. Empty streams produce one empty part.
+        """
+        return max(1, int(math.ceil(self._stream_length / self._part_size)))
+
+    @staticmethod
+    def _regular_file_fileno(stream: io.IOBase) -> Optional[int]:
+        """
+        File descriptor of the regular file underlying a stream, if any and if it can be read
+        at arbitrary positions.
+
+        Args:
+            stream:     A file-like object.
+
+        Returns:
+            int:    The file descriptor, or ``None`` (e.g., for in-memory streams, pipes, sockets).
         """
-        return int(math.ceil(self._stream_length / self._part_size))
+        if not hasattr(os, "pread"):
+            return None
+        try:
+            fd = stream.fileno()
+            return fd if stat.S_ISREG(os.fstat(fd).st_mode) else None
+        except (AttributeError, OSError, ValueError):
+            return None
 
 
-class MonitoredIOIterator:
+class PartReader:
     """
-    Monitored file-like object.
-    Consumes an iterator of bytes and updates a TransferProgress object.
+    Length-delimited iterator of chunks of bytes of a part of the data to upload.
+    Updates a :py:class:`TransferProgress` object as data flows and interrupts the flow of data
+    when the worker performing the transfer is stopped.
+
+    Since its length is known, `requests` sends it with a `Content-Length` header instead of
+    using chunked transfer encoding.
 
     Args:
+        source:     Data of the part, either a `memoryview` (chunks are slices of it and no data
+                    is copied) or a file-like object (e.g., a :py:class:`RangedStream`).
+        length:     Length of the part in bytes.
         progress:   Instance of :py:class:`TransferProgress` to update.
-        iterator:   Iterator of bytes to consume.
         worker:     Instance of :py:class:`WorkerThread` performing the transfer job.
+        bufsize:    Buffer size in number of `bytes`. Each chunk will have at most this size.
+        pool:       (Optional) A :py:class:`BufferPool` object the buffer chunks are read into is
+                    taken from (and given back to), if its buffers are large enough.
     """
 
     def __init__(
         self,
+        source: Union[memoryview, io.RawIOBase],
+        length: int,
         progress: TransferProgress,
-        iterator: Union[None, Iterator[bytes]] = None,
-        worker: Union[None, WorkerThread] = None,
+        worker: WorkerThread,
+        bufsize: int = TRANSFER_BUF_SIZE_B,
+        pool: Optional[BufferPool] = None,
     ):
+        self._source = source
+        self._length = length
         self._progress = progress
-        self._iterator = iterator
         self._worker = worker
-        self._transferred_bytes = 0
-        self._last_time = None
-
-    def set_iterator(self, iterator: Iterator[bytes]):
-        """
-        Updates the underlying iterator of bytes to consume data from.
-
-        Args:
-            iterator:   Iterator of bytes to consume.
-        """
-        self._iterator = iterator
+        self._bufsize = bufsize
+        self._pool = pool
+        # slice of the data in memory handed out last, released once it was sent
+        self._view: Optional[memoryview] = None
 
-    def set_worker(self, worker: WorkerThread):
+    def __len__(self) -> int:
         """
-        Sets the current worker thread.
-
-        Args:
-            worker: Worker thread.
+        Length of the part in bytes.
         """
-        self._worker = worker
+        return self._length
 
-    def __iter__(self):
+    def close(self):
         """
-        Activates a proxy iterator
+        Releases the last chunk handed out, in case the caller stopped asking for chunks before
+        the end (e.g., on error). The chunk must not be used afterwards.
         """
-        return self
+        if self._view is not None:
+            self._view.release()
+            self._view = None
 
-    def __next__(self) -> bytes:
+    def __iter__(self) -> Iterator[Union[bytes, memoryview]]:
         """
-        Next element from the iterator.
-
-        Returns:
-            bytes:  Chunk of bytes from the underlying iterator.
+        Iterator of chunks of bytes.
 
         Raises:
-            StopIteration:      End of the iterator reached.
             TransferAborted:    The worker was interrupted.
-        """
-        if self._iterator is None:
-            raise StopIteration()
-        if self._worker.is_shutdown:
-            raise TransferAborted()
-        # ---
-        data = next(self._iterator)
-        self._transferred_bytes += len(data)
-        # update progress handler
-        self._progress.update(transferred=self._transferred_bytes)
-        # update time
-        self._last_time = time.time()
-        # yield
-        return data
+            TransferError:      The source ended before `length` bytes were read.
+        """
+        in_memory = isinstance(self._source, memoryview)
+        # the chunks of a stream are all read into a single buffer, reusing it is safe because urllib3
+        # sends each chunk before it asks for the next one
+        buffer = None
+        pooled = self._pool is not None and self._pool.size >= self._bufsize
+        if not in_memory and hasattr(self._source, "readinto"):
+            buffer = self._pool.acquire() if pooled else bytearray(self._bufsize)
+        cursor = 0
+        try:
+            while cursor < self._length:
+                if self._worker.is_shutdown:
+                    raise TransferAborted()
+                # ---
+                size = min(self._bufsize, self._length - cursor)
+                if in_memory:
+                    chunk = self._view = self._source[cursor : cursor + size]
+                else:
+                    chunk = self._read(size, buffer)
+                if not chunk:
+                    raise TransferError(f"Source ended after {cursor} of {self._length} bytes.")
+                cursor += len(chunk)
+                # update progress handler
+                self._progress.update(delta_transferred=len(chunk))
+                yield chunk
+                # the chunk was sent, its view of the data is not needed anymore
+                self.close()
+        finally:
+            # the last chunk was sent once the caller asks for the next one (or stops asking)
+            self.close()
+            if pooled and buffer is not None:
+                self._pool.release(buffer)
+
+    def _read(self, size: int, buffer: Optional[bytearray] = None) -> Union[bytes, bytearray, memoryview]:
+        """
+        Reads a chunk of `size` bytes from the source stream. Short reads (e.g., from pipes or
+        sockets) are merged, so that each chunk costs a single send.
+
+        Args:
+            size:   Number of bytes to read.
+            buffer: (Optional) Buffer of at least `size` bytes to read the chunk into, if the
+                    source stream supports it. The previous chunk read into it is overwritten.
+
+        Returns:
+            bytes:  Chunk of bytes, shorter than `size` only if the stream ended.
+        """
+        if not hasattr(self._source, "readinto"):
+            chunk = self._source.read(size)
+            if not chunk or len(chunk) >= size:
+                return chunk
+            buffer = bytearray(chunk)
+            while len(buffer) < size:
+                chunk = self._source.read(size - len(buffer))
+                if not chunk:
+                    break
+                buffer += chunk
+            return buffer
+        # fill the buffer in place, the previous chunk was sent already
+        view = memoryview(buffer if buffer is not None else bytearray(size))[:size]
+        filled = 0
+        while filled < size:
+            n = self._source.readinto(view[filled:])
+            if not n:
+                break
+            filled += n
+        return view[:filled]
@@ -0,0 +1,254 @@
+import hashlib
+import json
+import re
+import tempfile
+import threading
+import time
+import unittest
+from contextlib import suppress
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, List, Optional, Set, Tuple
+from unittest import mock
+from urllib.parse import parse_qs, quote, unquote, urlparse
+
+from dt_data_api import DataClient
+
+# token accepted by the fake Data API, any user ID works
+FAKE_TOKEN = "dt1-fake-token"
+FAKE_UID = 42
+
+
+class FakeDCSS:
+    """
+    In-process stand-in for the Data API and the S3 storage spaces behind it.
+
+    Objects are stored per storage space as ``(content, headers)``, the headers are returned as
+    they are with each HEAD and GET request (e.g., ``x-amz-meta-number-of-parts``).
+    """
+
+    def __init__(self):
+        self.objects: Dict[str, Tuple[bytes, Dict[str, str]]] = {}
+        # objects whose body is cut after the given number of bytes, the connection is then closed
+        self.truncated: Dict[str, int] = {}
+        # objects sent without a `Content-Length` (the body ends when the connection closes)
+        self.unsized: Set[str] = set()
+        # status code returned by the storage to any request for the given object (or listing of
+        # a storage space, as `<bucket>/`)
+        self.errors: Dict[str, int] = {}
+        # seconds to wait before sending each MiB of a body
+        self.delay: float = 0
+        # method and key of every request to the storage (and of every URL signed, as `SIGN`)
+        self.requests: List[Tuple[str, str]] = []
+        self._lock = threading.Lock()
+        self._server: Optional[ThreadingHTTPServer] = None
+
+    @property
+    def url(self) -> str:
+        host, port = self._server.server_address
+        return f"http://{host}:{port}"
+
+    def put(self, bucket: str, key: str, content: bytes, headers: Dict[str, str] = None):
+        self.objects[f"{bucket}/{key}"] = (content, dict(headers or {}))
+
+    def get(self, bucket: str, key: str) -> Optional[bytes]:
+        obj = self.objects.get(f"{bucket}/{key}")
+        return obj[0] if obj is not None else None
+
+    def keys(self, bucket: str) -> List[str]:
+        return sorted(k.split("/", 1)[1] for k in self.objects if k.startswith(f"{bucket}/"))
+
+    def count(self, method: str) -> int:
+        with self._lock:
+            return sum(1 for m, _ in self.requests if m == method)
+
+    def start(self):
+        self._server = ThreadingHTTPServer(("127.0.0.1", 0), _handler(self))
+        self._server.daemon_threads = True
+        threading.Thread(target=self._server.serve_forever, daemon=True).start()
+
+    def stop(self):
+        self._server.shutdown()
+        self._server.server_close()
+
+    def _record(self, method: str, key: str):
+        with self._lock:
+            self.requests.append((method, key))
+
+
+def _handler(dcss: FakeDCSS):
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+
+        def log_message(self, *_):
+            pass
+
+        def handle(self):
+            # clients hang up mid-request when their transfer is aborted
+            with suppress(ConnectionError):
+                super().handle()
+
+        def _key(self) -> Tuple[str, Dict[str, List[str]]]:
+            url = urlparse(self.path)
+            return unquote(url.path.lstrip("/")), parse_qs(url.query)
+
+        def _send(self, code: int, body: bytes = b"", headers: Dict[str, str] = None, head: bool = False):
+            self.send_response(code)
+            headers = dict(headers or {})
+            headers.setdefault("Content-Length", str(len(body)))
+            for name, value in headers.items():
+                self.send_header(name, value)
+            self.end_headers()
+            if not head:
+                self.wfile.write(body)
+
+        def _fail(self, key: str, head: bool = False) -> bool:
+            code = dcss.errors.get(key)
+            if code is None:
+                return False
+            body = b"" if head else f"<Error><Code>{code}</Code></Error>".encode("utf-8")
+            self._send(code, body, head=head)
+            return True
+
+        def _headers(self, key: str) -> Tuple[bytes, Dict[str, str]]:
+            content, meta = dcss.objects[key]
+            headers = {
+                "ETag": '"%s"' % hashlib.md5(content).hexdigest(),
+                "Last-Modified": "Wed, 12 Oct 2022 17:50:00 GMT",
+                "Content-Length": str(len(content)),
+                **meta,
+            }
+            return content, headers
+
+        def do_HEAD(self):
+            key, _ = self._key()
+            dcss._record("HEAD", key)
+            if self._fail(key, head=True):
+                return
+            if key not in dcss.objects:
+                return self._send(404, head=True)
+            _, headers = self._headers(key)
+            self._send(200, headers=headers, head=True)
+
+        def do_GET(self):
+            key, qs = self._key()
+            if key.startswith("v1/"):
+                return self._authorize(key)
+            if "prefix" in qs or key.endswith("/"):
+                return self._list(key, qs.get("prefix", [""])[0])
+            dcss._record("GET", key)
+            if self._fail(key):
+                return
+            if key not in dcss.objects:
+                return self._send(404, b"<Error><Code>NoSuchKey</Code></Error>")
+            content, headers = self._headers(key)
+            code = 200
+            match = re.match(r"bytes=(\d+)-(\d*)", self.headers.get("Range", ""))
+            if match:
+                first = int(match.group(1))
+                last = min(int(match.group(2) or len(content) - 1), len(content) - 1)
+                headers["Content-Range"] = f"bytes {first}-{last}/{len(content)}"
+                content, code = content[first : last + 1], 206
+            headers["Content-Length"] = str(len(content))
+            if key in dcss.unsized:
+                del headers["Content-Length"]
+                self.close_connection = True
+            self.send_response(code)
+            for name, value in headers.items():
+                self.send_header(name, value)
+            self.end_headers()
+            # cut the body short and drop the connection, as a network failure would
+            limit = dcss.truncated.get(key)
+            if limit is not None:
+                content = content[:limit]
+                self.close_connection = True
+            for start in range(0, len(content), 1024**2):
+                if dcss.delay:
+                    time.sleep(dcss.delay)
+                try:
+                    self.wfile.write(content[start : start + 1024**2])
+                except OSError:
+                    return
+
+        def do_PUT(self):
+            key, _ = self._key()
+            dcss._record("PUT", key)
+            if "Content-Length" not in self.headers:
+                # S3 does not accept chunked uploads to signed URLs
+                return self._send(411)
+            length = int(self.headers["Content-Length"])
+            content = self.rfile.read(length)
+            if self._fail(key):
+                return
+            meta = {k: v for k, v in self.headers.items() if k.lower().startswith("x-amz-meta-")}
+            dcss.objects[key] = (content, meta)
+            self._send(200)
+
+        def do_DELETE(self):
+            key, _ = self._key()
+            dcss._record("DELETE", key)
+            dcss.objects.pop(key, None)
+            self._send(204)
+
+        def _list(self, bucket: str, prefix: str):
+            bucket = bucket.rstrip("/")
+            dcss._record("LIST", f"{bucket}/{prefix}")
+            if self._fail(f"{bucket}/"):
+                return
+            contents = ""
+            for key in sorted(dcss.objects):
+                if key.startswith(f"{bucket}/{prefix}"):
+                    content, _ = dcss.objects[key]
+                    contents += (
+                        f"<Contents><Key>{key.split('/', 1)[1]}</Key>"
+                        f"<LastModified>2022-12-13T03:12:27.000Z</LastModified>"
+                        f"<ETag>&quot;{hashlib.md5(content).hexdigest()}&quot;</ETag>"
+                        f"<Size>{len(content)}</Size><StorageClass>STANDARD</StorageClass></Contents>"
+                    )
+            body = (
+                f'<?xml version="1.0" encoding="UTF-8"?>'
+                f"<ListBucketResult><IsTruncated>false</IsTruncated>{contents}</ListBucketResult>"
+            )
+            self._send(200, body.encode("utf-8"), {"Content-Type": "application/xml"})
+
+        def _authorize(self, path: str):
+            _, action, bucket, obj = path.split("/", 3)
+            if self.headers.get("X-Duckietown-Token") != FAKE_TOKEN:
+                body = {"code": 403, "message": "Forbidden", "data": {}}
+                return self._send(200, json.dumps(body).encode("utf-8"))
+            bucket = bucket[len("duckietown-") : -len("-storage")]
+            dcss._record("SIGN", f"{bucket}/{obj}")
+            if action == "list_objects_v2":
+                url = f"{dcss.url}/{bucket}/?prefix={quote(obj)}"
+            else:
+                date = time.strftime("%Y%m%dT%H%M%SZ", time.gmtime())
+                url = f"{dcss.url}/{bucket}/{quote(obj)}?X-Amz-Date={date}&X-Amz-Expires=3600"
+            body = {"code": 200, "message": "", "data": {"url": url}}
+            self._send(200, json.dumps(body).encode("utf-8"), {"Content-Type": "application/json"})
+
+    return Handler
+
+
+class FakeDCSSTestCase(unittest.TestCase):
+    """
+    Test case running against a fresh :py:class:`FakeDCSS` with an authenticated client, and a
+    temporary directory `tmp` for local files.
+    """
+
+    def setUp(self):
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.tmp = tmp.name
+        self.dcss = FakeDCSS()
+        self.dcss.start()
+        self.addCleanup(self.dcss.stop)
+        token = mock.Mock(uid=FAKE_UID)
+        for target, value in [
+            ("dt_data_api.storage.PUBLIC_STORAGE_URL", self.dcss.url + "/{bucket}/{object}"),
+            ("dt_data_api.api.DATA_API_URL", self.dcss.url + "/v1/{action}/{bucket}/{object}"),
+            ("dt_data_api.api.DuckietownToken.from_string", mock.Mock(return_value=token)),
+        ]:
+            patcher = mock.patch(target, value)
+            patcher.start()
+            self.addCleanup(patcher.stop)
+        self.client = DataClient(FAKE_TOKEN)
+        self.addCleanup(self.client.close)
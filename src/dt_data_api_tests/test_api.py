@@ -0,0 +1,53 @@
+import os
+import unittest
+
+from dt_data_api import DataClient, TransferError, TransferStatus
+from dt_data_api.api import httpx
+
+from .fake_dcss import FAKE_TOKEN, FakeDCSSTestCase
+
+
+class TestHTTP2(FakeDCSSTestCase):
+    def test_off_by_default(self):
+        self.assertIsNone(self.client.api._api_client)
+
+    @unittest.skipIf(httpx is None, "httpx and h2 are not installed")
+    def test_authorize(self):
+        client = DataClient(FAKE_TOKEN, http2=True)
+        self.addCleanup(client.close)
+        content = os.urandom(1024)
+        self.dcss.put("private", "file.bin", content)
+        handler = client.storage("private").download("file.bin")
+        handler.join()
+        self.assertEqual(handler.status, TransferStatus.FINISHED)
+        self.assertEqual(handler.data, content)
+
+
+class TestSignedURLs(FakeDCSSTestCase):
+    def setUp(self):
+        super().setUp()
+        self.dcss.put("private", "file.bin", os.urandom(1024))
+        self.storage = self.client.storage("private")
+
+    def test_reused(self):
+        self.storage.head("file.bin")
+        self.storage.head("file.bin")
+        self.assertEqual(self.dcss.count("SIGN"), 1)
+
+    def test_rejected_url_is_forgotten(self):
+        self.storage.head("file.bin")
+        # the storage stops accepting the URL before it expires
+        self.dcss.errors["private/file.bin"] = 403
+        self.storage.head("file.bin")
+        self.assertEqual(self.dcss.count("SIGN"), 1)
+        del self.dcss.errors["private/file.bin"]
+        self.storage.head("file.bin")
+        self.assertEqual(self.dcss.count("SIGN"), 2)
+
+    def test_rejected_download_is_not_missing(self):
+        self.dcss.errors["private/file.bin"] = 403
+        with self.assertRaises(TransferError):
+            self.storage.download("file.bin")
+        # no listing or probing for parts of an object the storage refuses to serve
+        self.assertEqual(self.dcss.count("LIST"), 0)
+        self.assertEqual(self.dcss.count("HEAD"), 0)
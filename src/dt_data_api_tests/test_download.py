@@ -0,0 +1,340 @@
+import asyncio
+import gzip
+import os
+import signal
+import time
+import unittest
+from concurrent.futures import ThreadPoolExecutor
+from unittest import mock
+
+import requests
+
+from dt_data_api import TransferError, TransferStatus
+
+from .fake_dcss import FakeDCSSTestCase
+
+
+class TestDownloadTruncated(FakeDCSSTestCase):
+    def setUp(self):
+        super().setUp()
+        self.content = os.urandom(2 * 1024**2)
+        self.dcss.put("public", "file.bin", self.content)
+        # the connection drops half-way through the body
+        self.dcss.truncated["public/file.bin"] = 1024**2
+        self.storage = self.client.storage("public")
+
+    def test_to_memory(self):
+        handler = self.storage.download("file.bin")
+        handler.join()
+        self.assertEqual(handler.status, TransferStatus.ERROR)
+
+    def test_to_disk(self):
+        destination = os.path.join(self.tmp, "file.bin")
+        handler = self.storage.download("file.bin", destination)
+        handler.join()
+        self.assertEqual(handler.status, TransferStatus.ERROR)
+        if os.path.exists(destination):
+            with open(destination, "rb") as f:
+                self.assertNotEqual(f.read(), self.content)
+
+    def test_segments(self):
+        # ranged responses are cut too
+        self.dcss.truncated["public/file.bin"] = 256 * 1024
+        with mock.patch("dt_data_api.storage.DOWNLOAD_SEGMENT_SIZE_B", 512 * 1024):
+            handler = self.storage.download("file.bin")
+            handler.join()
+        self.assertEqual(handler.status, TransferStatus.ERROR)
+
+    def test_resume_after_truncation(self):
+        destination = os.path.join(self.tmp, "file.bin")
+        handler = self.storage.download("file.bin", destination, resume=True)
+        handler.join()
+        self.assertEqual(handler.status, TransferStatus.ERROR)
+        # the connection is back, only the missing bytes are downloaded
+        del self.dcss.truncated["public/file.bin"]
+        handler = self.storage.download("file.bin", destination, resume=True)
+        handler.join()
+        self.assertEqual(handler.status, TransferStatus.FINISHED)
+        with open(destination, "rb") as f:
+            self.assertEqual(f.read(), self.content)
+
+
+class TestDownloadEncoded(FakeDCSSTestCase):
+    def setUp(self):
+        super().setUp()
+        self.content = os.urandom(1024**2) * 2
+        self.dcss.put("public", "file.bin", gzip.compress(self.content), {"Content-Encoding": "gzip"})
+        self.storage = self.client.storage("public")
+
+    def test_decoded(self):
+        handler = self.storage.download("file.bin")
+        handler.join()
+        self.assertEqual(handler.status, TransferStatus.FINISHED)
+        self.assertEqual(handler.data, self.content)
+
+    def test_truncated(self):
+        self.dcss.truncated["public/file.bin"] = 1024**2
+        handler = self.storage.download("file.bin", os.path.join(self.tmp, "file.bin"))
+        handler.join()
+        self.assertEqual(handler.status, TransferStatus.ERROR)
+
+
+@unittest.skipUnless(hasattr(os, "fork"), "fork() is not available")
+class TestDownloadForked(FakeDCSSTestCase):
+    def setUp(self):
+        super().setUp()
+        self.content = os.urandom(1024**2)
+        self.dcss.put("public", "file.bin", self.content)
+        self.storage = self.client.storage("public")
+        # the threads and the connections of the parent are up before forking
+        handler = self.storage.download("file.bin")
+        handler.join()
+        self.assertEqual(handler.status, TransferStatus.FINISHED)
+
+    def _download_in_child(self):
+        pid = os.fork()
+        if pid == 0:
+            code = 1
+            try:
+                handler = self.storage.download("file.bin")
+                handler.join()
+                code = 0 if handler.status == TransferStatus.FINISHED and handler.data == self.content else 2
+            finally:
+                os._exit(code)
+        for _ in range(200):
+            done, status = os.waitpid(pid, os.WNOHANG)
+            if done:
+                break
+            time.sleep(0.1)
+        else:
+            os.kill(pid, signal.SIGKILL)
+            os.waitpid(pid, 0)
+            self.fail("The download in the forked child did not finish.")
+        self.assertEqual(os.waitstatus_to_exitcode(status), 0)
+
+    def test_download_in_child(self):
+        self._download_in_child()
+
+    def test_fork_while_parts_cache_is_locked(self):
+        # another thread of the parent is looking up the parts of an object
+        with self.storage._parts_cache_lock:
+            self._download_in_child()
+
+
+class TestDownloadClosed(FakeDCSSTestCase):
+    def setUp(self):
+        super().setUp()
+        self.content = os.urandom(4 * 1024**2)
+        self.dcss.put("public", "file.bin", self.content)
+        # the download is still running when the client is closed
+        self.dcss.delay = 0.1
+
+    def test_close_waits(self):
+        with mock.patch("dt_data_api.storage.DOWNLOAD_SEGMENT_SIZE_B", 1024**2):
+            with self.client:
+                handler = self.client.storage("public").download("file.bin")
+        self.assertEqual(handler.status, TransferStatus.FINISHED)
+        self.assertEqual(handler.data, self.content)
+
+    def test_close_on_error_aborts(self):
+        destination = os.path.join(self.tmp, "file.bin")
+        with self.assertRaises(KeyboardInterrupt):
+            with self.client:
+                handler = self.client.storage("public").download("file.bin", destination)
+                raise KeyboardInterrupt()
+        self.assertEqual(handler.status, TransferStatus.STOPPED)
+        self.assertFalse(os.path.exists(destination))
+
+
+class TestDownloadJournal(FakeDCSSTestCase):
+    def setUp(self):
+        super().setUp()
+        self.content = os.urandom(1024**2)
+        self.dcss.put("public", "file.bin", self.content)
+        self.storage = self.client.storage("public")
+
+    def test_no_journal_without_resume(self):
+        destination = os.path.join(self.tmp, "file.bin")
+        self.dcss.truncated["public/file.bin"] = 512 * 1024
+        handler = self.storage.download("file.bin", destination)
+        handler.join()
+        self.assertEqual(handler.status, TransferStatus.ERROR)
+        self.assertEqual(os.listdir(self.tmp), [])
+
+    def test_missing_directory(self):
+        for resume in [False, True]:
+            destination = os.path.join(self.tmp, "missing", "file.bin")
+            handler = self.storage.download("file.bin", destination, resume=resume)
+            handler.join()
+            self.assertEqual(handler.status, TransferStatus.ERROR)
+
+    def test_resume_over_foreign_file(self):
+        destination = os.path.join(self.tmp, "file.bin")
+        with open(destination, "wb") as f:
+            f.write(b"unrelated")
+        with self.assertRaises(ValueError):
+            self.storage.download("file.bin", destination, resume=True)
+        # the file is left alone and nothing is downloaded
+        with open(destination, "rb") as f:
+            self.assertEqual(f.read(), b"unrelated")
+        self.assertEqual(self.dcss.count("GET"), 0)
+        # it is replaced on demand
+        handler = self.storage.download("file.bin", destination, force=True, resume=True)
+        handler.join()
+        self.assertEqual(handler.status, TransferStatus.FINISHED)
+        with open(destination, "rb") as f:
+            self.assertEqual(f.read(), self.content)
+
+    def test_resume_after_object_changed(self):
+        destination = os.path.join(self.tmp, "file.bin")
+        self.dcss.truncated["public/file.bin"] = 512 * 1024
+        handler = self.storage.download("file.bin", destination, resume=True)
+        handler.join()
+        self.assertEqual(handler.status, TransferStatus.ERROR)
+        # the journal does not match the new object
+        del self.dcss.truncated["public/file.bin"]
+        content = os.urandom(1024**2)
+        self.dcss.put("public", "file.bin", content)
+        with self.assertRaises(ValueError):
+            self.storage.download("file.bin", destination, resume=True)
+        handler = self.storage.download("file.bin", destination, force=True, resume=True)
+        handler.join()
+        self.assertEqual(handler.status, TransferStatus.FINISHED)
+        with open(destination, "rb") as f:
+            self.assertEqual(f.read(), content)
+
+
+class TestDownloadPreallocate(FakeDCSSTestCase):
+    def setUp(self):
+        super().setUp()
+        self.content = os.urandom(2 * 1024**2)
+        self.dcss.put("public", "file.bin", self.content)
+        self.storage = self.client.storage("public")
+        self.destination = os.path.join(self.tmp, "file.bin")
+
+    def _download(self):
+        handler = self.storage.download("file.bin", self.destination)
+        handler.join()
+        self.assertEqual(handler.status, TransferStatus.FINISHED)
+        with open(self.destination, "rb") as f:
+            self.assertEqual(f.read(), self.content)
+
+    def test_no_emulated_allocation(self):
+        # the emulation of posix_fallocate writes every block of the file
+        with mock.patch("os.posix_fallocate", create=True) as posix_fallocate:
+            self._download()
+        posix_fallocate.assert_not_called()
+
+    def test_allocation_not_supported(self):
+        fallocate = mock.Mock(return_value=-1)
+        with mock.patch("dt_data_api.utils._get_fallocate", return_value=fallocate):
+            self._download()
+        fallocate.assert_called_once()
+
+
+class TestDownloadAbort(FakeDCSSTestCase):
+    def setUp(self):
+        super().setUp()
+        self.content = os.urandom(4 * 1024**2)
+        self.dcss.put("public", "file.bin", self.content)
+        self.storage = self.client.storage("public")
+        self.destination = os.path.join(self.tmp, "file.bin")
+        # each segment of 1 MiB takes a while, they are downloaded one at a time
+        self.dcss.delay = 0.3
+        patcher = mock.patch("dt_data_api.storage.DOWNLOAD_SEGMENT_SIZE_B", 1024**2)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def _abort_after_first_segment(self, handler):
+        deadline = time.time() + 10
+        while handler.progress.transferred < 1024**2 and time.time() < deadline:
+            time.sleep(0.01)
+        handler.abort(block=True)
+        self.assertEqual(handler.status, TransferStatus.STOPPED)
+
+    def test_abort(self):
+        handler = self.storage.download("file.bin", self.destination, max_parallel_parts=1)
+        self._abort_after_first_segment(handler)
+        # partial files are removed
+        self.assertEqual(os.listdir(self.tmp), [])
+
+    def test_resume_after_abort(self):
+        handler = self.storage.download("file.bin", self.destination, resume=True, max_parallel_parts=1)
+        self._abort_after_first_segment(handler)
+        self.assertTrue(os.path.isfile(self.destination + ".dtresume"))
+        self.dcss.delay = 0
+        requests = self.dcss.count("GET")
+        handler = self.storage.download("file.bin", self.destination, resume=True)
+        handler.join()
+        self.assertEqual(handler.status, TransferStatus.FINISHED)
+        with open(self.destination, "rb") as f:
+            self.assertEqual(f.read(), self.content)
+        # the segments already on disk are not downloaded again
+        self.assertLess(self.dcss.count("GET") - requests, 4)
+        self.assertEqual(os.listdir(self.tmp), ["file.bin"])
+
+
+class TestDownloadHeaders(FakeDCSSTestCase):
+    def setUp(self):
+        super().setUp()
+        self.content = os.urandom(1024**2)
+        self.dcss.put("public", "file.bin", self.content)
+        self.storage = self.client.storage("public")
+
+    def test_unsized_response(self):
+        # the size comes from the listing instead
+        self.dcss.unsized.add("public/file.bin")
+        handler = self.storage.download("file.bin")
+        handler.join()
+        self.assertEqual(handler.status, TransferStatus.FINISHED)
+        self.assertEqual(handler.data, self.content)
+        self.assertEqual(self.dcss.count("LIST"), 1)
+
+    def test_request_error(self):
+        get = mock.Mock(side_effect=requests.exceptions.ReadTimeout())
+        with mock.patch.object(self.client.api.session, "get", get):
+            with self.assertRaises(TransferError):
+                self.storage.download("file.bin")
+
+
+class TestDownloadAsync(FakeDCSSTestCase):
+    def setUp(self):
+        super().setUp()
+        self.content = os.urandom(2 * 1024**2)
+        self.dcss.put("public", "file.bin", self.content)
+        self.storage = self.client.storage("public")
+
+    def test_waiting_holds_no_thread(self):
+        # every download takes a while
+        self.dcss.delay = 0.5
+
+        async def main():
+            loop = asyncio.get_running_loop()
+            loop.set_default_executor(ThreadPoolExecutor(max_workers=1))
+            downloads = asyncio.gather(*[self.storage.async_download("file.bin") for _ in range(3)])
+            # the only thread of the default executor is still free for others while waiting
+            await asyncio.sleep(0.1)
+            await asyncio.wait_for(loop.run_in_executor(None, lambda: None), timeout=0.5)
+            return await downloads
+
+        for handler in asyncio.run(main()):
+            self.assertEqual(handler.status, TransferStatus.FINISHED)
+            self.assertEqual(handler.data, self.content)
+
+    def test_cancel_aborts(self):
+        self.dcss.delay = 0.5
+        handlers = []
+        download = self.storage.download
+
+        def spy(*args):
+            handlers.append(download(*args))
+            return handlers[-1]
+
+        async def main():
+            with mock.patch.object(self.storage, "download", side_effect=spy):
+                await asyncio.wait_for(self.storage.async_download("file.bin"), timeout=0.3)
+
+        with self.assertRaises(asyncio.TimeoutError):
+            asyncio.run(main())
+        handlers[0].join()
+        self.assertEqual(handlers[0].status, TransferStatus.STOPPED)
@@ -0,0 +1,84 @@
+import os
+import unittest
+from datetime import datetime
+
+from dt_data_api import DataClient, Item, TransferStatus
+from dt_data_api.item import UNKNOWN_SIZE
+
+from .fake_dcss import FAKE_TOKEN, FakeDCSSTestCase
+
+
+class TestItem(unittest.TestCase):
+    def test_parse_headers(self):
+        headers = {
+            "Last-Modified": "Wed, 12 Oct 2022 17:50:00 GMT",
+            "ETag": '"3e497b280f946c19ea1cb984b59b3c23"',
+            "Content-Length": "425",
+        }
+        item = Item.parse_headers("file.txt", headers)
+        self.assertEqual(item.last_modified, datetime(2022, 10, 12, 17, 50, 0))
+        self.assertIsNone(item.last_modified.tzinfo)
+        self.assertEqual(item.etag, "3e497b280f946c19ea1cb984b59b3c23")
+        self.assertEqual(item.size, 425)
+
+    def test_parse_missing_headers(self):
+        item = Item.parse_headers("file.txt", {"Last-Modified": "not a date"})
+        self.assertEqual(item.last_modified, datetime.min)
+        self.assertEqual(item.etag, "")
+        self.assertEqual(item.size, UNKNOWN_SIZE)
+
+
+class TestListObjects(FakeDCSSTestCase):
+    def test_public_prefix_is_quoted(self):
+        self.dcss.put("public", "my dir/a+b.txt", b"a")
+        self.dcss.put("public", "my dir/a b.txt", b"b")
+        storage = self.client.storage("public")
+        self.assertEqual(storage.list_objects("my dir/a+"), ["my dir/a+b.txt"])
+
+
+class TestMultipartObjects(FakeDCSSTestCase):
+    def setUp(self):
+        super().setUp()
+        self.content = os.urandom(3 * 1024**2)
+        self.storage = self.client.storage("private")
+        handler = self.storage.upload(self.content, "file.bin", part_size=1024**2)
+        handler.join()
+        self.assertEqual(handler.status, TransferStatus.FINISHED)
+        self.parts = ["file.bin.000", "file.bin.001", "file.bin.002"]
+
+    def test_head(self):
+        # the object only exists as its parts
+        with self.assertRaises(FileNotFoundError):
+            self.storage.head("file.bin")
+        headers = self.storage.head("file.bin.000")
+        self.assertEqual(headers["x-amz-meta-number-of-parts"], "3")
+        self.assertEqual(int(headers["Content-Length"]), 1024**2)
+
+    def test_list(self):
+        self.assertEqual(self.storage.list_objects("file.bin"), self.parts)
+
+    def test_delete(self):
+        # the parts of the object are remembered by the download
+        handler = self.storage.download("file.bin")
+        handler.join()
+        self.assertEqual(handler.data, self.content)
+        with self.assertRaises(FileNotFoundError):
+            self.storage.delete("file.bin")
+        for part in self.parts:
+            self.assertTrue(self.storage.delete(part))
+        self.assertEqual(self.dcss.keys("private"), [])
+        with self.assertRaises(FileNotFoundError):
+            self.storage.download("file.bin")
+
+    def test_download_without_listing(self):
+        # the parts are found with HEAD requests when listing the storage is forbidden
+        self.dcss.errors["private/"] = 403
+        client = DataClient(FAKE_TOKEN)
+        self.addCleanup(client.close)
+        storage = client.storage("private")
+        handler = storage.download("file.bin")
+        handler.join()
+        self.assertEqual(handler.status, TransferStatus.FINISHED)
+        self.assertEqual(handler.data, self.content)
+        self.assertEqual(self.dcss.count("LIST"), 1)
+        self.assertGreaterEqual(self.dcss.count("HEAD"), len(self.parts))
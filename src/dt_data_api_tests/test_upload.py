@@ -0,0 +1,152 @@
+import os
+import threading
+from unittest import mock
+
+from dt_data_api import DataClient, Storage, TransferStatus
+
+from .fake_dcss import FakeDCSSTestCase
+
+
+class TestUploadParts(FakeDCSSTestCase):
+    def setUp(self):
+        super().setUp()
+        self.content = os.urandom(20 * 1024**2)
+        self.storage = self.client.storage("private")
+
+    def test_single_object_by_default(self):
+        handler = self.storage.upload(self.content, "file.bin")
+        handler.join()
+        self.assertEqual(handler.status, TransferStatus.FINISHED)
+        self.assertEqual(self.dcss.keys("private"), ["file.bin"])
+        self.assertEqual(self.dcss.get("private", "file.bin"), self.content)
+        # the object is usable as any other
+        self.assertEqual(int(self.storage.head("file.bin")["Content-Length"]), len(self.content))
+        self.assertEqual(self.storage.list_objects(""), ["file.bin"])
+        self.storage.delete("file.bin")
+        self.assertEqual(self.dcss.keys("private"), [])
+
+    def test_multipart(self):
+        handler = self.storage.upload(self.content, "file.bin", part_size=8 * 1024**2)
+        handler.join()
+        self.assertEqual(handler.status, TransferStatus.FINISHED)
+        self.assertEqual(self.dcss.keys("private"), ["file.bin.000", "file.bin.001", "file.bin.002"])
+        # the parts are put back together on download
+        handler = self.storage.download("file.bin")
+        handler.join()
+        self.assertEqual(handler.status, TransferStatus.FINISHED)
+        self.assertEqual(handler.data, self.content)
+
+    def test_fewer_parts(self):
+        handler = self.storage.upload(self.content, "file.bin", part_size=8 * 1024**2)
+        handler.join()
+        self.assertEqual(handler.status, TransferStatus.FINISHED)
+        # the layout of the object is remembered by the download
+        handler = self.storage.download("file.bin")
+        handler.join()
+        self.assertEqual(handler.data, self.content)
+        # the new version of the object has fewer parts, the last one of the old version stays
+        content = os.urandom(16 * 1024**2)
+        handler = self.storage.upload(content, "file.bin", part_size=8 * 1024**2)
+        handler.join()
+        self.assertEqual(handler.status, TransferStatus.FINISHED)
+        self.assertIn("file.bin.002", self.dcss.keys("private"))
+        # stale trailing parts are not part of the object, with and without a remembered layout
+        for storage in [self.storage, self.client.storage("private")]:
+            handler = storage.download("file.bin")
+            handler.join()
+            self.assertEqual(handler.status, TransferStatus.FINISHED)
+            self.assertEqual(handler.data, content)
+
+
+class TestUploadPipe(FakeDCSSTestCase):
+    def setUp(self):
+        super().setUp()
+        self.content = os.urandom(20 * 1024**2)
+        self.storage = self.client.storage("private")
+
+    def _pipe(self):
+        r, w = os.pipe()
+
+        def feed():
+            with open(w, "wb") as f:
+                f.write(self.content)
+
+        threading.Thread(target=feed, daemon=True).start()
+        reader = open(r, "rb", buffering=0)
+        self.addCleanup(reader.close)
+        return reader
+
+    def test_single_object(self):
+        handler = self.storage.upload(self._pipe(), "file.bin", length=len(self.content))
+        handler.join()
+        self.assertEqual(handler.status, TransferStatus.FINISHED)
+        self.assertEqual(self.dcss.get("private", "file.bin"), self.content)
+
+    def test_multipart(self):
+        handler = self.storage.upload(
+            self._pipe(), "file.bin", length=len(self.content), part_size=8 * 1024**2
+        )
+        handler.join()
+        self.assertEqual(handler.status, TransferStatus.FINISHED)
+        parts = [self.dcss.get("private", key) for key in self.dcss.keys("private")]
+        self.assertEqual(len(parts), 3)
+        self.assertEqual(b"".join(parts), self.content)
+
+
+class TestUploadAbort(FakeDCSSTestCase):
+    def test_abort(self):
+        content = os.urandom(20 * 1024**2)
+        storage = self.client.storage("private")
+        handler = storage.upload(content, "file.bin", part_size=1024**2, max_parallel_parts=1)
+        handler.abort(block=True)
+        self.assertEqual(handler.status, TransferStatus.STOPPED)
+        self.assertLess(len(self.dcss.keys("private")), 20)
+
+
+class TestUploadFile(FakeDCSSTestCase):
+    def setUp(self):
+        super().setUp()
+        self.content = os.urandom(3 * 1024**2)
+        self.source = os.path.join(self.tmp, "file.bin")
+        with open(self.source, "wb") as f:
+            f.write(self.content)
+        self.storage = self.client.storage("private")
+        # keep hold of the mappings of the source file
+        self.mappings = []
+        map_file = Storage._map_file
+
+        def spy(*args):
+            mapping = map_file(*args)
+            self.mappings.append(mapping)
+            return mapping
+
+        patcher = mock.patch.object(Storage, "_map_file", side_effect=spy)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_unmapped_when_finished(self):
+        handler = self.storage.upload(self.source, "file.bin", part_size=1024**2)
+        handler.join()
+        self.assertEqual(handler.status, TransferStatus.FINISHED)
+        parts = [self.dcss.get("private", key) for key in self.dcss.keys("private")]
+        self.assertEqual(b"".join(parts), self.content)
+        self.assertTrue(self.mappings[0].closed)
+
+    def test_unmapped_on_error(self):
+        self.dcss.errors["private/file.bin.001"] = 500
+        handler = self.storage.upload(self.source, "file.bin", part_size=1024**2)
+        handler.join()
+        self.assertEqual(handler.status, TransferStatus.ERROR)
+        self.assertTrue(self.mappings[0].closed)
+
+    def test_not_mapped_on_illegal_arguments(self):
+        with self.assertRaises(ValueError):
+            self.storage.upload(self.source, "file.bin", part_size=0)
+        with self.assertRaises(ValueError):
+            self.storage.upload(self.source, "file.bin", max_parallel_parts=0)
+        # the token is checked before the file is mapped too
+        anonymous = DataClient()
+        self.addCleanup(anonymous.close)
+        with self.assertRaises(ValueError):
+            anonymous.storage("private").upload(self.source, "file.bin")
+        self.assertEqual(self.mappings, [])